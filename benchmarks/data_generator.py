@@ -0,0 +1,120 @@
+"""
+Synthetic Data Generator
+Seeded generators for insurance-style and policy/claims-style datasets used by
+the benchmark suite. The same (n_rows, seed, chunk_rows) always yields the same
+file, so results from different machines and commits are comparable.
+"""
+import os
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+REGIONS = ['northeast', 'northwest', 'southeast', 'southwest']
+
+PROVINCES = ['Gauteng', 'Western Cape', 'KwaZulu-Natal', 'North West', 'Mpumalanga',
+             'Eastern Cape', 'Limpopo', 'Free State', 'Northern Cape']
+PROVINCE_WEIGHTS = [0.39, 0.17, 0.17, 0.08, 0.05, 0.05, 0.04, 0.03, 0.02]
+
+VEHICLE_TYPES = ['Passenger Vehicle', 'Medium Commercial', 'Heavy Commercial',
+                 'Light Commercial', 'Bus']
+VEHICLE_WEIGHTS = [0.92, 0.05, 0.015, 0.01, 0.005]
+
+GENDERS = ['Male', 'Female', 'Not specified']
+GENDER_WEIGHTS = [0.55, 0.10, 0.35]
+
+MONTHS = pd.date_range('2013-10-01', '2015-08-01', freq='MS')
+
+
+def _zipf_choice(rng, n_values, n_rows, exponent=1.1):
+    """Draw indices in [0, n_values) with a Zipf-like (long tail) distribution."""
+    weights = 1.0 / np.arange(1, n_values + 1) ** exponent
+    weights /= weights.sum()
+    return rng.choice(n_values, size=n_rows, p=weights)
+
+
+def generate_insurance_data(n_rows, seed=42):
+    """Generate rows shaped like data/insurance.csv (age, sex, bmi, ... charges)."""
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 65, n_rows)
+    bmi = np.clip(rng.normal(30.7, 6.1, n_rows), 15, 55)
+    children = rng.choice(6, size=n_rows, p=[0.43, 0.24, 0.18, 0.12, 0.02, 0.01])
+    smoker = rng.random(n_rows) < 0.2
+
+    # Charges grow with age and BMI and roughly triple for smokers
+    base = 250 * age + 300 * np.maximum(bmi - 25, 0) + 500 * children
+    charges = base * rng.lognormal(0, 0.35, n_rows) + 1000
+    charges = np.where(smoker, charges * 2.8 + 8000, charges)
+
+    return pd.DataFrame({
+        'age': age,
+        'sex': np.where(rng.random(n_rows) < 0.5, 'male', 'female'),
+        'bmi': bmi.round(2),
+        'children': children,
+        'smoker': np.where(smoker, 'yes', 'no'),
+        'region': np.asarray(REGIONS)[rng.integers(0, len(REGIONS), n_rows)],
+        'charges': charges.round(2)
+    })
+
+
+def generate_policy_claims_data(n_rows, seed=42, n_postal_codes=5000, n_makes=500,
+                                claim_rate=0.05, row_offset=0):
+    """
+    Generate rows shaped like the ACIS policy/claims extract.
+
+    TotalClaims is zero-inflated (only ``claim_rate`` of rows carry a claim) with a
+    heavy lognormal tail; PostalCode and make follow long-tailed distributions over
+    ``n_postal_codes`` and ``n_makes`` distinct values.
+    """
+    rng = np.random.default_rng(seed)
+    policy_ids = np.arange(row_offset, row_offset + n_rows)
+
+    premium = rng.lognormal(4.5, 1.0, n_rows)
+    premium[rng.random(n_rows) < 0.1] = 0.0  # policies with no premium in the month
+
+    has_claim = rng.random(n_rows) < claim_rate
+    claims = np.zeros(n_rows)
+    claims[has_claim] = rng.lognormal(8.5, 1.4, has_claim.sum())
+
+    postal_codes = 1000 + _zipf_choice(rng, n_postal_codes, n_rows)
+    makes = _zipf_choice(rng, n_makes, n_rows)
+
+    return pd.DataFrame({
+        'UnderwrittenCoverID': policy_ids * 3 + 1,
+        'PolicyID': policy_ids // 4,
+        'TransactionMonth': MONTHS[rng.integers(0, len(MONTHS), n_rows)].strftime('%Y-%m-%d'),
+        'TotalPremium': premium.round(2),
+        'TotalClaims': claims.round(2),
+        'Province': rng.choice(PROVINCES, size=n_rows, p=PROVINCE_WEIGHTS),
+        'PostalCode': postal_codes,
+        'VehicleType': rng.choice(VEHICLE_TYPES, size=n_rows, p=VEHICLE_WEIGHTS),
+        'Gender': rng.choice(GENDERS, size=n_rows, p=GENDER_WEIGHTS),
+        'make': np.char.add('MAKE_', makes.astype(str))
+    })
+
+
+def write_dataset(kind, n_rows, path, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Write ``n_rows`` of a synthetic dataset to ``path`` in chunks.
+
+    ``kind`` is ``'insurance'`` or ``'policy_claims'``. Each chunk gets its own child
+    seed so memory stays bounded by ``chunk_rows`` at any size.
+    """
+    generators = {
+        'insurance': lambda n, s, offset: generate_insurance_data(n, seed=s),
+        'policy_claims': lambda n, s, offset: generate_policy_claims_data(n, seed=s, row_offset=offset),
+    }
+    if kind not in generators:
+        raise ValueError(f"Unknown dataset kind: {kind}")
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    n_chunks = max(1, -(-n_rows // chunk_rows))
+    child_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    written = 0
+    for i, child in enumerate(child_seeds):
+        size = min(chunk_rows, n_rows - written)
+        chunk = generators[kind](size, child, written)
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        written += size
+    return path
@@ -0,0 +1,228 @@
+"""
+Benchmark Runner
+Times CSVLoader, EDAService, ABTestingService and the integration script on
+seeded synthetic data, writes a JSON results file and optionally compares it
+against a stored baseline to flag regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 10k,1m --output bench_results.json
+    python -m benchmarks.run_benchmarks --sizes 10k --baseline benchmarks/baseline.json
+
+benchmarks/baseline.json holds 10k-row timings. Timings depend on the machine,
+so regenerate it where the comparison runs:
+    python -m benchmarks.run_benchmarks --sizes 10k --repeat 3 --output benchmarks/baseline.json
+
+CLI startup (importing src.interfaces.cli in a fresh interpreter) is timed on
+every run and fails the run when it exceeds --startup-budget-ms.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use('Agg')
+
+from benchmarks.data_generator import write_dataset
+from src.application.ab_testing_service import ABTestingService
+from src.application.eda_service import EDAService
+from src.infrastructure.csv_loader import CSVLoader
+from src.infrastructure.plotting import MatplotlibPlotter
+from tests.helpers import HEAVY_MODULES, NullPlotter
+
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_SECONDS = 0.05  # ignore jitter on cases that only take a few milliseconds
+STARTUP_BUDGET_MS = 100
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def parse_size(text):
+    """Parse sizes such as '10k', '1m' or '2500' into a row count."""
+    text = text.strip().lower()
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def _timed(func, repeat):
+    """Return the best wall time of ``repeat`` calls, silencing their prints."""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(n_rows, data_dir, seed=42, repeat=1, with_plots=False):
+    """Run every benchmark at one dataset size and return a list of result dicts."""
+    import integrate_data
+
+    insurance_path = os.path.join(data_dir, f'insurance_{n_rows}_{seed}.csv')
+    claims_path = os.path.join(data_dir, f'policy_claims_{n_rows}_{seed}.csv')
+    if not os.path.exists(insurance_path):
+        write_dataset('insurance', n_rows, insurance_path, seed=seed)
+    if not os.path.exists(claims_path):
+        write_dataset('policy_claims', n_rows, claims_path, seed=seed)
+
+    loader = CSVLoader()
+    plotter = MatplotlibPlotter() if with_plots else NullPlotter()
+
+    def integrate():
+        df_insurance = loader.load_data(insurance_path)
+        df_claims = loader.load_data(claims_path)
+        integrate_data.integrate_data(df_insurance, df_claims)
+
+    def figures():
+        integrate_data.generate_figures(loader.load_data(claims_path))
+
+    cases = [
+        ('csv_loader.load_data', lambda: loader.load_data(claims_path)),
+        ('eda_service.perform_initial_analysis',
+         lambda: EDAService(loader, plotter).perform_initial_analysis(claims_path)),
+        ('ab_testing_service.run_all_tests',
+         lambda: ABTestingService(loader).run_all_tests(insurance_path)),
+        ('integrate_data.integrate_data', integrate),
+        ('integrate_data.generate_figures', figures),
+    ]
+
+    results = []
+    saved_paths = integrate_data.OUTPUT_FILE, integrate_data.FIGURES_DIR
+    # The integrated CSV is as large as the inputs, so it lives in a directory removed after the run
+    with tempfile.TemporaryDirectory(prefix='bench_') as work_dir:
+        # Point the integration script at scratch locations instead of data/ and reports/
+        integrate_data.OUTPUT_FILE = os.path.join(work_dir, 'integrated.csv')
+        integrate_data.FIGURES_DIR = work_dir
+        try:
+            for name, func in cases:
+                seconds = _timed(func, repeat)
+                results.append({
+                    'benchmark': name,
+                    'rows': n_rows,
+                    'seconds': round(seconds, 4),
+                    'rows_per_sec': round(n_rows / seconds, 1) if seconds > 0 else None
+                })
+                print(f"   {name:<42} {n_rows:>12,} rows {seconds:>10.3f}s")
+        finally:
+            integrate_data.OUTPUT_FILE, integrate_data.FIGURES_DIR = saved_paths
+    return results
+
+
+def measure_startup(repeat=5):
+    """
+    Time importing the CLI module in a fresh interpreter (best of ``repeat``).
+
+    Each run also reports which heavy packages the import pulled in, so a
+    regression to eager imports is visible even when it is still fast.
+    """
+    probe = ("import sys, time; start = time.perf_counter(); import src.interfaces.cli; "
+             "elapsed = time.perf_counter() - start; "
+             f"print(elapsed, *[m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    best, loaded = float('inf'), []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                                capture_output=True, text=True).stdout.split()
+        best = min(best, float(output[0]))
+        loaded = output[1:]
+    print(f"   {'cli import':<42} {best * 1000:>21.1f}ms"
+          + (f"  (loaded: {', '.join(loaded)})" if loaded else ""))
+    return {'benchmark': 'cli.import', 'rows': 0, 'seconds': round(best, 4),
+            'rows_per_sec': None, 'heavy_modules': loaded}
+
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=MIN_DELTA_SECONDS):
+    """
+    Compare two result lists keyed by (benchmark, rows).
+
+    Returns a list of regressions, each with the baseline and current timings and
+    their ratio, for every case that got slower by more than ``tolerance`` and by
+    at least ``min_delta`` seconds.
+    """
+    baseline_index = {(r['benchmark'], r['rows']): r for r in baseline}
+    regressions = []
+    for result in current:
+        base = baseline_index.get((result['benchmark'], result['rows']))
+        if base is None or base['seconds'] <= 0:
+            continue
+        ratio = result['seconds'] / base['seconds']
+        if ratio > 1 + tolerance and result['seconds'] - base['seconds'] >= min_delta:
+            regressions.append({
+                'benchmark': result['benchmark'],
+                'rows': result['rows'],
+                'baseline_seconds': base['seconds'],
+                'current_seconds': result['seconds'],
+                'ratio': round(ratio, 3)
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Insurance Risk Analytics benchmarks")
+    parser.add_argument("--sizes", type=str, default="10k,1m",
+                        help="Comma-separated dataset sizes, e.g. 10k,1m,10m")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the data generator")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (best time is kept)")
+    parser.add_argument("--data-dir", type=str, default=os.path.join(tempfile.gettempdir(), 'acis_bench_data'),
+                        help="Where generated datasets are cached")
+    parser.add_argument("--output", type=str, default="bench_results.json", help="Results file to write")
+    parser.add_argument("--baseline", type=str, help="Baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case is flagged (0.25 = 25%%)")
+    parser.add_argument("--with-plots", action="store_true", help="Render EDA figures while timing")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Fail when importing the CLI takes longer than this")
+    args = parser.parse_args(argv)
+
+    print("\nBenchmarking CLI startup...")
+    startup = measure_startup()
+    results = [startup]
+    for size in args.sizes.split(','):
+        n_rows = parse_size(size)
+        print(f"\nBenchmarking {n_rows:,} rows...")
+        results.extend(run_suite(n_rows, args.data_dir, seed=args.seed,
+                                 repeat=args.repeat, with_plots=args.with_plots))
+
+    report = {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to: {args.output}")
+
+    status = 0
+    if startup['seconds'] * 1000 > args.startup_budget_ms:
+        print(f"\nCLI import took {startup['seconds'] * 1000:.1f}ms, over the "
+              f"{args.startup_budget_ms:.0f}ms budget")
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%} tolerance:")
+            for r in regressions:
+                print(f"   {r['benchmark']} @ {r['rows']:,} rows: "
+                      f"{r['baseline_seconds']:.3f}s -> {r['current_seconds']:.3f}s ({r['ratio']:.2f}x)")
+            return 1
+        print("\nNo regressions against baseline.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
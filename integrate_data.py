@@ -2,10 +2,17 @@
 Data Integration Script
 Integrates insurance.csv into insurance_claims.csv and regenerates EDA figures.
 """
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.application.dedup import DEFAULT_KEYS, KEEP_RULES, Deduplicator
+from src.application.validation import SchemaValidator
+from src.infrastructure.pipeline import BackgroundWriter
+from src.infrastructure.plotting import figure
 
 # Paths
 DATA_DIR = 'data'
@@ -17,12 +24,17 @@ OUTPUT_FILE = os.path.join(DATA_DIR, 'insurance_claims_integrated.csv')
 # Ensure figures directory exists
 os.makedirs(FIGURES_DIR, exist_ok=True)
 
-def load_and_explore():
+def load_and_explore(pipelined=False):
     """Load both CSV files and show their structure."""
     print("=" * 60)
     print("LOADING DATA FILES")
     print("=" * 60)
     
+    # In pipelined mode the claims file is prefetched while insurance.csv is parsed
+    prefetcher = ThreadPoolExecutor(max_workers=1) if pipelined else None
+    if prefetcher:
+        claims_future = prefetcher.submit(pd.read_csv, CLAIMS_FILE, low_memory=False)
+    
     # Load insurance.csv
     print(f"\n1. Loading {INSURANCE_FILE}...")
     df_insurance = pd.read_csv(INSURANCE_FILE, low_memory=False)
@@ -31,14 +43,33 @@ def load_and_explore():
     
     # Load insurance_claims.csv
     print(f"\n2. Loading {CLAIMS_FILE}...")
-    df_claims = pd.read_csv(CLAIMS_FILE, low_memory=False)
+    if prefetcher:
+        df_claims = claims_future.result()
+        prefetcher.shutdown()
+    else:
+        df_claims = pd.read_csv(CLAIMS_FILE, low_memory=False)
     print(f"   Shape: {df_claims.shape}")
     print(f"   Columns: {list(df_claims.columns[:10])}...")
     
     return df_insurance, df_claims
 
-def integrate_data(df_insurance, df_claims):
-    """Integrate the two dataframes."""
+def reconcile(frames, keys=DEFAULT_KEYS, keep='last'):
+    """
+    Stack ``frames`` without double-counting rows present in more than one.
+
+    Rows sharing ``keys`` are collapsed to one according to ``keep`` (by
+    default the row from the later frame).
+    """
+    dedup = Deduplicator(keys=keys, keep=keep)
+    chunks = list(dedup.run([lambda frame=frame: [frame] for frame in frames]))
+    report = dedup.report
+    print(f"\nReconciled {report.rows_in:,} rows into {report.rows_out:,} "
+          f"({report.exact_duplicates:,} exact duplicates, {report.key_conflicts:,} key conflicts "
+          f"resolved by '{keep}')")
+    return pd.concat(chunks, ignore_index=True, sort=False), report
+
+def integrate_data(df_insurance, df_claims, keys=DEFAULT_KEYS, keep='last'):
+    """Integrate the two dataframes, dropping rows present in both."""
     print("\n" + "=" * 60)
     print("INTEGRATING DATA")
     print("=" * 60)
@@ -61,9 +92,7 @@ def integrate_data(df_insurance, df_claims):
     
     if len(common_cols) > 5:  # If many common columns, likely same structure
         print("\nConcatenating datasets (similar structure detected)...")
-        # Align columns and concatenate
-        all_cols = list(set(df_insurance.columns) | set(df_claims.columns))
-        df_integrated = pd.concat([df_insurance, df_claims], ignore_index=True, sort=False)
+        df_integrated, _ = reconcile([df_insurance, df_claims], keys, keep)
     else:  # Different structures - try to find key columns for merge
         print("\nAttempting merge on potential key columns...")
         potential_keys = ['PolicyNumber', 'Policy_Number', 'policy_number', 'id', 'ID', 'PolicyID']
@@ -78,7 +107,7 @@ def integrate_data(df_insurance, df_claims):
             df_integrated = pd.merge(df_claims, df_insurance, on=key_col, how='outer', suffixes=('', '_insurance'))
         else:
             print("   No key column found, concatenating with all columns...")
-            df_integrated = pd.concat([df_insurance, df_claims], ignore_index=True, sort=False)
+            df_integrated, _ = reconcile([df_insurance, df_claims], keys, keep)
     
     print(f"\nIntegrated dataset shape: {df_integrated.shape}")
     
@@ -88,129 +117,109 @@ def integrate_data(df_insurance, df_claims):
     
     return df_integrated
 
-def generate_figures(df):
+def _figure(filepath, writer=None, figsize=(10, 6)):
+    """Figure saved to ``filepath`` when the block exits, on the writer thread when one is given."""
+    return figure(filepath, writer, figsize=figsize, dpi=100, bbox_inches='tight')
+
+def generate_figures(df, writer=None):
     """Generate EDA figures from the integrated data."""
     print("\n" + "=" * 60)
     print("GENERATING FIGURES")
     print("=" * 60)
     
-    # Clean column names
-    df.columns = df.columns.str.strip()
-    
-    # Convert numeric columns
-    for col in ['TotalPremium', 'TotalClaims']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Convert date column
-    if 'TransactionMonth' in df.columns:
-        df['TransactionMonth'] = pd.to_datetime(df['TransactionMonth'], errors='coerce')
+    # Clean column names and coerce typed columns in one validation pass
+    validator = SchemaValidator()
+    df = validator.validate(df)
+    if validator.report.total_rejected:
+        print(f"\n   Rejected values by column:\n{validator.report.summary()}")
     
     figures_generated = []
     
     # 1. Distribution plots
     for col in ['TotalPremium', 'TotalClaims']:
         if col in df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.histplot(df[col].dropna(), kde=True)
-            plt.title(f"Distribution of {col}")
-            plt.xlabel(col)
-            plt.ylabel("Frequency")
             filepath = os.path.join(FIGURES_DIR, f'dist_{col}.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.histplot(df[col].dropna(), kde=True)
+                plt.title(f"Distribution of {col}")
+                plt.xlabel(col)
+                plt.ylabel("Frequency")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
     
     # 2. Boxplots for outlier detection
     for col in ['TotalPremium', 'TotalClaims']:
         if col in df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.boxplot(x=df[col].dropna())
-            plt.title(f"Boxplot of {col}")
             filepath = os.path.join(FIGURES_DIR, f'box_{col}.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.boxplot(x=df[col].dropna())
+                plt.title(f"Boxplot of {col}")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
     
     # 3. Scatter plot
     if 'TotalPremium' in df.columns and 'TotalClaims' in df.columns:
-        plt.figure(figsize=(10, 6))
         valid_data = df.dropna(subset=['TotalPremium', 'TotalClaims'])
         sample_size = min(5000, len(valid_data))
         if sample_size > 0:
             sample = valid_data.sample(sample_size) if len(valid_data) > sample_size else valid_data
-            sns.scatterplot(data=sample, x='TotalPremium', y='TotalClaims', alpha=0.5)
-            plt.title("TotalPremium vs TotalClaims")
             filepath = os.path.join(FIGURES_DIR, 'scatter_TotalPremium_TotalClaims.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.scatterplot(data=sample, x='TotalPremium', y='TotalClaims', alpha=0.5)
+                plt.title("TotalPremium vs TotalClaims")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
     
     # Alternative: If using insurance.csv structure (charges as premium proxy)
     if 'charges' in df.columns:
-        plt.figure(figsize=(10, 6))
-        sns.histplot(df['charges'].dropna(), kde=True)
-        plt.title("Distribution of Charges")
         filepath = os.path.join(FIGURES_DIR, 'dist_charges.png')
-        plt.savefig(filepath, dpi=100, bbox_inches='tight')
-        plt.close()
+        with _figure(filepath, writer):
+            sns.histplot(df['charges'].dropna(), kde=True)
+            plt.title("Distribution of Charges")
         figures_generated.append(filepath)
         print(f"   Generated: {filepath}")
         
         # Charges boxplot
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x=df['charges'].dropna())
-        plt.title("Boxplot of Charges")
         filepath = os.path.join(FIGURES_DIR, 'box_charges.png')
-        plt.savefig(filepath, dpi=100, bbox_inches='tight')
-        plt.close()
+        with _figure(filepath, writer):
+            sns.boxplot(x=df['charges'].dropna())
+            plt.title("Boxplot of Charges")
         figures_generated.append(filepath)
         print(f"   Generated: {filepath}")
         
         # Charges by smoker
         if 'smoker' in df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.boxplot(data=df, x='smoker', y='charges')
-            plt.title("Charges by Smoker Status")
             filepath = os.path.join(FIGURES_DIR, 'box_charges_by_smoker.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.boxplot(data=df, x='smoker', y='charges')
+                plt.title("Charges by Smoker Status")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
         
         # Charges by region
         if 'region' in df.columns:
-            plt.figure(figsize=(12, 6))
-            sns.barplot(data=df, x='region', y='charges', estimator='mean')
-            plt.title("Average Charges by Region")
             filepath = os.path.join(FIGURES_DIR, 'bar_charges_by_region.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer, figsize=(12, 6)):
+                sns.barplot(data=df, x='region', y='charges', estimator='mean')
+                plt.title("Average Charges by Region")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
         
         # Age vs Charges scatter
         if 'age' in df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.scatterplot(data=df, x='age', y='charges', hue='smoker' if 'smoker' in df.columns else None, alpha=0.6)
-            plt.title("Age vs Charges")
             filepath = os.path.join(FIGURES_DIR, 'scatter_age_charges.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.scatterplot(data=df, x='age', y='charges', hue='smoker' if 'smoker' in df.columns else None, alpha=0.6)
+                plt.title("Age vs Charges")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
         
         # BMI vs Charges
         if 'bmi' in df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.scatterplot(data=df, x='bmi', y='charges', hue='smoker' if 'smoker' in df.columns else None, alpha=0.6)
-            plt.title("BMI vs Charges")
             filepath = os.path.join(FIGURES_DIR, 'scatter_bmi_charges.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer):
+                sns.scatterplot(data=df, x='bmi', y='charges', hue='smoker' if 'smoker' in df.columns else None, alpha=0.6)
+                plt.title("BMI vs Charges")
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
 
@@ -223,13 +232,11 @@ def generate_figures(df):
                 group['LossRatio'] = group['TotalClaims'] / group['TotalPremium']
                 group = group.reset_index()
                 
-                plt.figure(figsize=(12, 6))
-                sns.barplot(data=group, x=cat_col, y='LossRatio')
-                plt.title(f'Loss Ratio by {cat_col}')
-                plt.xticks(rotation=45, ha='right')
                 filepath = os.path.join(FIGURES_DIR, f'bar_Loss_Ratio_by_{cat_col}.png')
-                plt.savefig(filepath, dpi=100, bbox_inches='tight')
-                plt.close()
+                with _figure(filepath, writer, figsize=(12, 6)):
+                    sns.barplot(data=group, x=cat_col, y='LossRatio')
+                    plt.title(f'Loss Ratio by {cat_col}')
+                    plt.xticks(rotation=45, ha='right')
                 figures_generated.append(filepath)
                 print(f"   Generated: {filepath}")
     
@@ -239,31 +246,27 @@ def generate_figures(df):
         monthly = monthly.dropna().sort_values('TransactionMonth')
         
         if len(monthly) > 1:
-            plt.figure(figsize=(14, 7))
-            plt.plot(monthly['TransactionMonth'], monthly['TotalPremium'], label='TotalPremium')
-            plt.plot(monthly['TransactionMonth'], monthly['TotalClaims'], label='TotalClaims')
-            plt.title("Time Series Analysis")
-            plt.legend()
-            plt.xticks(rotation=45)
             filepath = os.path.join(FIGURES_DIR, 'time_series.png')
-            plt.savefig(filepath, dpi=100, bbox_inches='tight')
-            plt.close()
+            with _figure(filepath, writer, figsize=(14, 7)):
+                plt.plot(monthly['TransactionMonth'], monthly['TotalPremium'], label='TotalPremium')
+                plt.plot(monthly['TransactionMonth'], monthly['TotalClaims'], label='TotalClaims')
+                plt.title("Time Series Analysis")
+                plt.legend()
+                plt.xticks(rotation=45)
             figures_generated.append(filepath)
             print(f"   Generated: {filepath}")
     
     # 6. Additional analysis plots
     # Premium distribution by Province
     if 'Province' in df.columns and 'TotalPremium' in df.columns:
-        plt.figure(figsize=(12, 6))
-        province_premium = df.groupby('Province')['TotalPremium'].sum().sort_values(ascending=False)
-        province_premium.plot(kind='bar')
-        plt.title('Total Premium by Province')
-        plt.xlabel('Province')
-        plt.ylabel('Total Premium')
-        plt.xticks(rotation=45, ha='right')
         filepath = os.path.join(FIGURES_DIR, 'bar_Premium_by_Province.png')
-        plt.savefig(filepath, dpi=100, bbox_inches='tight')
-        plt.close()
+        with _figure(filepath, writer, figsize=(12, 6)):
+            province_premium = df.groupby('Province')['TotalPremium'].sum().sort_values(ascending=False)
+            province_premium.plot(kind='bar')
+            plt.title('Total Premium by Province')
+            plt.xlabel('Province')
+            plt.ylabel('Total Premium')
+            plt.xticks(rotation=45, ha='right')
         figures_generated.append(filepath)
         print(f"   Generated: {filepath}")
     
@@ -298,15 +301,20 @@ def print_summary(df):
             loss_ratio = total_claims / total_premium
             print(f"\nOverall Loss Ratio: {loss_ratio:.2%}")
 
-if __name__ == "__main__":
+def main(pipelined=False, keys=DEFAULT_KEYS, keep='last'):
+    """Run the full integration. ``pipelined`` overlaps file reads and PNG writes."""
     # Load data
-    df_insurance, df_claims = load_and_explore()
+    df_insurance, df_claims = load_and_explore(pipelined=pipelined)
     
     # Integrate data
-    df_integrated = integrate_data(df_insurance, df_claims)
+    df_integrated = integrate_data(df_insurance, df_claims, keys=keys, keep=keep)
     
     # Generate figures
-    generate_figures(df_integrated)
+    if pipelined:
+        with BackgroundWriter() as writer:
+            generate_figures(df_integrated, writer=writer)
+    else:
+        generate_figures(df_integrated)
     
     # Print summary
     print_summary(df_integrated)
@@ -314,3 +322,16 @@ if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("DATA INTEGRATION COMPLETE!")
     print("=" * 60)
+    return df_integrated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Integrate insurance datasets and regenerate EDA figures")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Prefetch the second file and write figures on a background thread")
+    parser.add_argument("--dedup-keys", nargs="+", default=DEFAULT_KEYS,
+                        help="Columns identifying the same policy record in both files")
+    parser.add_argument("--keep", choices=KEEP_RULES, default="last",
+                        help="Which duplicate survives: last or first occurrence, or latest TransactionMonth "
+                             "(only with --dedup-keys that leave out TransactionMonth)")
+    args = parser.parse_args()
+    main(pipelined=args.pipelined, keys=args.dedup_keys, keep=args.keep)
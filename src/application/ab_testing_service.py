@@ -1,13 +1,24 @@
-from src.application.interfaces import IDataLoader
+from src.application.interfaces import IDataLoader, IResultCache
+from src.application.memoization import file_fingerprint, memoize, result_key
 import pandas as pd
 from scipy import stats
-from typing import Dict, Tuple, Any
+from typing import TYPE_CHECKING, Dict, Tuple, Any, Sequence
+
+if TYPE_CHECKING:
+    # Imported by the methods that use them, so run_all_tests does not load them
+    from src.application.contingency import SparseContingencyTable
+    from src.application.sampling import StratifiedSampleStore
+
+CLAIM_FREQUENCY_DIMENSIONS = ['Province', 'Gender', 'PostalCode', 'make']
 
 class ABTestingService:
     """Service for A/B Hypothesis Testing on insurance data."""
     
-    def __init__(self, data_loader: IDataLoader):
+    def __init__(self, data_loader: IDataLoader, sample_store: 'StratifiedSampleStore' = None,
+                 result_cache: IResultCache = None):
         self.data_loader = data_loader
+        self.sample_store = sample_store
+        self.result_cache = result_cache
         self.alpha = 0.05  # Significance level
         
     def load_and_prepare_data(self, file_path: str) -> pd.DataFrame:
@@ -124,31 +135,93 @@ class ABTestingService:
             'interpretation': self._interpret_result(p_value, 'bmi')
         }
     
-    def run_all_tests(self, file_path: str) -> Dict[str, Dict]:
-        """Run all hypothesis tests and return results."""
-        df = self.load_and_prepare_data(file_path)
-        
+    def test_claim_frequency(self, df: pd.DataFrame, dimension: str) -> Dict[str, Any]:
+        """
+        H₀: Claim frequency does not differ across ``dimension``.
+        Test: Chi-squared test of independence (with G-test) on a sparse table
+        """
+        from src.application.contingency import claim_frequency_tables
+
+        table = claim_frequency_tables([df], [dimension])[dimension]
+        return self._claim_frequency_result(dimension, table)
+    
+    def run_claim_frequency_tests(self, file_path: str,
+                                  dimensions: Sequence[str] = CLAIM_FREQUENCY_DIMENSIONS,
+                                  chunksize: int = 100_000) -> Dict[str, Dict]:
+        """
+        Claim vs no-claim tests for every dimension, from one streamed pass
+        over the file; high-cardinality dimensions (PostalCode, make) never
+        build a dense crosstab.
+        """
+        from src.application.contingency import claim_frequency_tables
+
+        def compute():
+            tables = claim_frequency_tables(self.data_loader.load_chunks(file_path, chunksize=chunksize), dimensions)
+            return {dim: self._claim_frequency_result(dim, table) for dim, table in tables.items()}
+
+        key = result_key('ABTestingService.run_claim_frequency_tests', file_fingerprint(file_path),
+                         dimensions=list(dimensions), alpha=self.alpha)
+        return memoize(self.result_cache, key, compute)
+    
+    def _claim_frequency_result(self, dimension: str, table: 'SparseContingencyTable') -> Dict[str, Any]:
+        result = table.statistics()
+        p_value = result['p_value']
         return {
-            'regional': self.test_regional_differences(df),
-            'gender': self.test_gender_differences(df),
-            'smoker': self.test_smoker_differences(df),
-            'bmi': self.test_bmi_category_differences(df)
+            'hypothesis': f'H₀: Claim frequency does not differ across {dimension}',
+            'test': 'Chi-squared test of independence',
+            **result,
+            'reject_null': bool(p_value < self.alpha),
+            'interpretation': self._interpret_result(p_value, 'claim_frequency', dimension)
         }
     
-    def _interpret_result(self, p_value: float, test_type: str) -> str:
-        """Generate business interpretation of the result."""
+    def estimate_mean_charges(self, file_path: str, by: str = 'smoker', approximate: bool = False,
+                              max_relative_error: float = 0.05, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Mean charges per ``by`` group with confidence intervals.
+
+        With ``approximate=True`` the stratified sample store answers; it falls
+        back to an exact scan when the requested precision cannot be met.
+        """
+        from src.application.sampling import approximate_estimates, exact_estimates
+
+        if approximate:
+            frame = approximate_estimates(self.sample_store, 'charges', by, None,
+                                          max_relative_error, confidence)
+            if frame is not None:
+                return frame
+        df = self.data_loader.load_data(file_path)
+        return exact_estimates(df, 'charges', by)
+    
+    def run_all_tests(self, file_path: str) -> Dict[str, Dict]:
+        """Run all hypothesis tests and return results (cached per file and ``alpha``)."""
+        def compute():
+            df = self.load_and_prepare_data(file_path)
+            return {
+                'regional': self.test_regional_differences(df),
+                'gender': self.test_gender_differences(df),
+                'smoker': self.test_smoker_differences(df),
+                'bmi': self.test_bmi_category_differences(df)
+            }
+        
+        key = result_key('ABTestingService.run_all_tests', file_fingerprint(file_path), alpha=self.alpha)
+        return memoize(self.result_cache, key, compute)
+    
+    def _interpret_result(self, p_value: float, test_type: str, dimension: str = None) -> str:
+        """Generate business interpretation of the result (``dimension`` names the tested factor)."""
         if p_value < self.alpha:
             interpretations = {
                 'regional': f"We REJECT the null hypothesis (p={p_value:.4f}). There are significant differences in insurance charges across regions. Consider regional premium adjustments.",
                 'gender': f"We REJECT the null hypothesis (p={p_value:.4f}). There are significant differences in insurance charges between genders. Review gender-based risk assessment policies.",
                 'smoker': f"We REJECT the null hypothesis (p={p_value:.4f}). Smokers have significantly different insurance charges than non-smokers. Smoking status is a major risk factor for premium calculation.",
-                'bmi': f"We REJECT the null hypothesis (p={p_value:.4f}). BMI categories show significant differences in insurance charges. Consider BMI-based risk segmentation."
+                'bmi': f"We REJECT the null hypothesis (p={p_value:.4f}). BMI categories show significant differences in insurance charges. Consider BMI-based risk segmentation.",
+                'claim_frequency': f"We REJECT the null hypothesis (p={p_value:.4f}). Claim frequency differs significantly across {dimension}. Consider it as a frequency rating factor."
             }
         else:
             interpretations = {
                 'regional': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant regional differences in charges. Uniform regional pricing may be appropriate.",
                 'gender': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant gender-based differences in charges. Gender-neutral pricing is supported.",
                 'smoker': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant difference between smokers and non-smokers. This is unexpected and warrants investigation.",
-                'bmi': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant differences across BMI categories. BMI may not be a primary risk driver."
+                'bmi': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant differences across BMI categories. BMI may not be a primary risk driver.",
+                'claim_frequency': f"We FAIL TO REJECT the null hypothesis (p={p_value:.4f}). No significant difference in claim frequency across {dimension}. It adds little as a frequency rating factor."
             }
         return interpretations.get(test_type, "Interpretation not available.")
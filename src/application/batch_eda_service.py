@@ -0,0 +1,140 @@
+from src.application.eda_service import EDAService
+from src.infrastructure.processes import limit_memory
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import contextlib
+import os
+import time
+import pandas as pd
+from typing import Callable, Dict, Any, List, Optional
+
+SUMMARY_COLUMNS = ['file', 'status', 'rows', 'total_premium', 'total_claims',
+                   'loss_ratio', 'seconds', 'output_dir', 'error']
+CRASH_ERROR = 'BrokenProcessPool: worker process died (killed by the OS or crashed)'
+
+
+def _run_job(loader_factory: Callable, plotter_factory: Callable,
+             file_path: str, output_dir: str) -> Dict[str, Any]:
+    """Run one EDA analysis and reduce it to a summary row."""
+    start = time.perf_counter()
+    summary = {'file': file_path, 'output_dir': output_dir}
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        plotter = plotter_factory(output_dir)
+        service = EDAService(loader_factory(), plotter)
+        # Keep each job's console output apart from the others
+        with open(os.path.join(output_dir, 'analysis.log'), 'w') as log, \
+                contextlib.redirect_stdout(log):
+            try:
+                df = service.perform_initial_analysis(file_path)
+            finally:
+                plotter.close()
+
+        total_premium = df['TotalPremium'].sum()
+        total_claims = df['TotalClaims'].sum()
+        summary.update({
+            'status': 'ok',
+            'rows': len(df),
+            'total_premium': total_premium,
+            'total_claims': total_claims,
+            'loss_ratio': total_claims / total_premium if total_premium > 0 else 0
+        })
+    except MemoryError:
+        summary.update({'status': 'failed', 'error': 'MemoryError: job exceeded its memory limit'})
+    except Exception as e:
+        summary.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+class BatchEDAService:
+    """
+    Service for running the EDA analysis over many datasets.
+
+    Jobs are scheduled on a bounded process pool, so one job can be loading its
+    CSV while another renders figures. Each worker can be given an address-space
+    limit; a job that exceeds it is reported as failed instead of taking the
+    whole run down. A worker that dies outright (OOM killer, segfault) breaks
+    the pool: the pool is rebuilt for the jobs not yet run, and the jobs that
+    were in flight at the time are re-run one at a time so only the one that
+    crashes again is reported as failed.
+    """
+
+    def __init__(self, loader_factory: Callable, plotter_factory: Callable,
+                 max_workers: Optional[int] = None, memory_limit_mb: Optional[int] = None,
+                 output_dir: str = 'reports/batch'):
+        # Factories (not instances) are shipped to the workers, so they must be picklable
+        self.loader_factory = loader_factory
+        self.plotter_factory = plotter_factory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memory_limit_mb = memory_limit_mb
+        self.output_dir = output_dir
+
+    def run(self, file_paths: List[str]) -> pd.DataFrame:
+        """Analyze every file and return one consolidated summary row per file."""
+        jobs = list(zip(file_paths, self._job_output_dirs(file_paths)))
+        if not jobs:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+        if self.max_workers <= 1:
+            # In-process run: no pool and no memory limit on the caller's process
+            rows = [_run_job(self.loader_factory, self.plotter_factory, path, out) for path, out in jobs]
+        else:
+            rows = self._run_pool(jobs)
+
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+    def _run_pool(self, jobs: List[tuple]) -> List[Dict[str, Any]]:
+        rows = [None] * len(jobs)
+        queue = list(range(len(jobs)))
+        suspects = []
+        while queue:
+            suspects.extend(self._run_until_broken(jobs, queue, rows, min(self.max_workers, len(queue))))
+        # Jobs that were running when a worker died: run each alone to find the culprit
+        for i in suspects:
+            if self._run_until_broken(jobs, [i], rows, 1):
+                rows[i] = {'file': jobs[i][0], 'output_dir': jobs[i][1], 'status': 'failed', 'error': CRASH_ERROR}
+        return rows
+
+    def _run_until_broken(self, jobs: List[tuple], queue: List[int], rows: List, workers: int) -> List[int]:
+        """
+        Run jobs taken from ``queue`` on a fresh pool, writing their summaries
+        into ``rows``. At most ``workers`` jobs are in flight, so when the pool
+        breaks the jobs that could have caused it are known; they are returned
+        (an empty list means every job finished).
+        """
+        with ProcessPoolExecutor(max_workers=workers, initializer=limit_memory,
+                                 initargs=(self.memory_limit_mb,)) as pool:
+            pending = {}
+            while queue or pending:
+                while queue and len(pending) < workers:
+                    path, out = jobs[queue[0]]
+                    try:
+                        future = pool.submit(_run_job, self.loader_factory, self.plotter_factory, path, out)
+                    except BrokenProcessPool:
+                        break
+                    pending[future] = queue.pop(0)
+                if not pending:
+                    return []
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = []
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        rows[i] = future.result()
+                    except BrokenProcessPool:
+                        broken.append(i)
+                if broken:
+                    return broken + list(pending.values())
+        return []
+
+    def _job_output_dirs(self, file_paths: List[str]) -> List[str]:
+        """One figure directory per input, named after the file stem."""
+        seen = {}
+        dirs = []
+        for path in file_paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            seen[stem] = seen.get(stem, 0) + 1
+            name = stem if seen[stem] == 1 else f"{stem}_{seen[stem]}"
+            dirs.append(os.path.join(self.output_dir, name))
+        return dirs
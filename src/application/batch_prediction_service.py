@@ -0,0 +1,128 @@
+from src.application.interfaces import IDataLoader, IModelStore
+from src.application.modeling_service import RISK_TIERS, prepare_features
+from src.infrastructure.processes import limit_memory, thread_safe_context
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import glob
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Sequence
+
+# Set once per worker process by ``_init_worker`` so the model is unpickled once, not per chunk
+_worker_model = None
+
+
+def _init_worker(model, memory_limit_mb: Optional[int]):
+    global _worker_model
+    limit_memory(memory_limit_mb)
+    # Parallelism comes from the pool; one thread per worker avoids oversubscribing the cores
+    if hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    _worker_model = model
+
+
+def _score_chunk(index: int, chunk: pd.DataFrame, tier_bounds: Sequence[float], output_dir: str,
+                 model=None) -> Dict[str, int]:
+    """Predict one chunk and write it into the per-tier partitions; returns rows per tier."""
+    model = model if model is not None else _worker_model
+    X, _ = prepare_features(chunk)
+    predicted = model.predict(X)
+    tiers = np.asarray(RISK_TIERS, dtype=object)[np.searchsorted(tier_bounds, predicted, side='right')]
+    scored = chunk.assign(PredictedPremium=predicted, RiskTier=tiers)
+
+    counts = {}
+    for tier, part in scored.groupby('RiskTier', sort=False):
+        partition = os.path.join(output_dir, f'RiskTier={tier}')
+        os.makedirs(partition, exist_ok=True)
+        part.to_csv(os.path.join(partition, f'part-{index:05d}.csv'), index=False)
+        counts[tier] = len(part)
+    return counts
+
+
+class BatchPredictionService:
+    """
+    Re-rates a whole extract with a persisted charges model.
+
+    The file is streamed in chunks through a process pool; at most
+    ``max_in_flight`` chunks are queued or being scored at once, so memory
+    stays flat however large the book is. Each worker writes its own output
+    files, partitioned by risk tier (``RiskTier=<tier>/part-<chunk>.csv``),
+    so nothing is gathered back in the parent but row counts.
+    """
+
+    def __init__(self, data_loader: IDataLoader, model_store: IModelStore, model_type: str = 'random_forest',
+                 max_workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 memory_limit_mb: Optional[int] = None, output_dir: str = 'reports/predictions'):
+        self.data_loader = data_loader
+        self.model_store = model_store
+        self.model_type = model_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.memory_limit_mb = memory_limit_mb
+        self.output_dir = output_dir
+
+    def run(self, file_path: str, chunksize: int = 100_000,
+            tier_bounds: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        """
+        Score ``file_path`` and return throughput and tier counts.
+
+        ``tier_bounds`` are the predicted-charge levels separating Low/Medium/High;
+        by default the ones recorded when the model was trained. Models saved
+        before tier bounds were recorded have none: pass ``tier_bounds`` or
+        retrain the model (``model train``), otherwise a ValueError is raised.
+        """
+        stored = self.model_store.load(self.model_type)
+        if stored is None:
+            raise ValueError(f"No trained '{self.model_type}' model in the store")
+        model, metadata = stored
+        if tier_bounds is None and 'tier_bounds' not in metadata:
+            raise ValueError(f"The stored '{self.model_type}' model has no tier bounds (it predates them); "
+                             f"retrain it with 'model train' or pass tier_bounds explicitly")
+        tier_bounds = list(tier_bounds if tier_bounds is not None else metadata['tier_bounds'])
+        if len(tier_bounds) != len(RISK_TIERS) - 1:
+            raise ValueError(f"Expected {len(RISK_TIERS) - 1} tier bounds, got {tier_bounds}")
+
+        self._clear_partitions()
+        start = time.perf_counter()
+        chunks = enumerate(self.data_loader.load_chunks(file_path, chunksize=chunksize))
+        if self.max_workers <= 1:
+            results = [_score_chunk(i, chunk, tier_bounds, self.output_dir, model) for i, chunk in chunks]
+        else:
+            results = self._run_pool(chunks, model, tier_bounds)
+        seconds = time.perf_counter() - start
+
+        tier_counts = {tier: sum(r.get(tier, 0) for r in results) for tier in RISK_TIERS}
+        rows = sum(tier_counts.values())
+        return {
+            'file': file_path,
+            'model_type': self.model_type,
+            'chunks': len(results),
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'rows_per_second': rows / seconds if seconds > 0 else float('nan'),
+            'tier_counts': tier_counts,
+            'output_dir': self.output_dir
+        }
+
+    def _run_pool(self, chunks, model, tier_bounds):
+        results = []
+        # The loader is already parsing ahead on a background thread, so workers must not be forked
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=thread_safe_context(),
+                                 initializer=_init_worker, initargs=(model, self.memory_limit_mb)) as pool:
+            pending = set()
+            for i, chunk in chunks:
+                if len(pending) >= self.max_in_flight:
+                    # Backpressure: stop reading until a chunk has been written out
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    results.extend(future.result() for future in done)
+                pending.add(pool.submit(_score_chunk, i, chunk, tier_bounds, self.output_dir))
+            done, _ = wait(pending)
+            results.extend(future.result() for future in done)
+        return results
+
+    def _clear_partitions(self):
+        """Drop partitions from a previous run so stale parts are not mixed in."""
+        for partition in glob.glob(os.path.join(self.output_dir, 'RiskTier=*')):
+            shutil.rmtree(partition)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+from typing import Any, Dict, Iterable, Sequence
+
+from src.application.groupby_engine import KeyEncoder
+
+
+class SparseContingencyTable:
+    """
+    Contingency table of two categorical variables stored as a sparse matrix.
+
+    Both variables are dictionary-encoded to integer codes as rows stream in;
+    each chunk is reduced to its distinct (row, column) cells and counts, and
+    only those are kept, so a PostalCode x make table never materializes its
+    empty cells. Once ``max_parts`` chunk summaries have accumulated they are
+    merged into one, so memory tracks the number of distinct cells rather than
+    the length of the stream. Chi-squared and G statistics are computed from
+    the non-zero cells alone.
+    """
+
+    def __init__(self, max_parts: int = 64):
+        self.row_encoder = KeyEncoder()
+        self.col_encoder = KeyEncoder()
+        self.max_parts = max_parts
+        self._parts = []
+        self._table = None
+
+    def update(self, rows, cols) -> 'SparseContingencyTable':
+        r = self.row_encoder.encode(np.asarray(rows))
+        c = self.col_encoder.encode(np.asarray(cols))
+        valid = (r >= 0) & (c >= 0)
+        cells, counts = np.unique((r[valid] << 32) | c[valid], return_counts=True)
+        self._parts.append((cells >> 32, cells & 0xFFFFFFFF, counts))
+        self._table = None
+        if len(self._parts) > self.max_parts:
+            self._compact()
+        return self
+
+    @property
+    def table(self) -> sparse.csr_matrix:
+        if self._table is None:
+            self._compact()
+        return self._table
+
+    def _compact(self):
+        """Merge the chunk summaries into the table and keep it as the only part."""
+        shape = (len(self.row_encoder), len(self.col_encoder))
+        if self._parts:
+            rows, cols, counts = (np.concatenate(p) for p in zip(*self._parts))
+        else:
+            rows = cols = counts = np.zeros(0, dtype=np.int64)
+        # Duplicate cells from different chunks are summed by the conversion
+        self._table = sparse.coo_matrix((counts, (rows, cols)), shape=shape).tocsr()
+        merged = self._table.tocoo()
+        self._parts = [(merged.row.astype(np.int64), merged.col.astype(np.int64), merged.data)] if merged.nnz else []
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dense view; only sensible for low-cardinality tables."""
+        return pd.DataFrame(self.table.toarray(), index=self.row_encoder.keys, columns=self.col_encoder.keys)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Pearson chi-squared and G-test of independence over the non-empty rows/columns."""
+        table = self.table.tocoo()
+        observed = table.data.astype(float)
+        row_sums = np.asarray(self.table.sum(axis=1)).ravel().astype(float)
+        col_sums = np.asarray(self.table.sum(axis=0)).ravel().astype(float)
+        n = observed.sum()
+        n_rows = int(np.count_nonzero(row_sums))
+        n_cols = int(np.count_nonzero(col_sums))
+        dof = (n_rows - 1) * (n_cols - 1)
+
+        if n == 0 or dof <= 0:
+            return {'chi2_statistic': np.nan, 'p_value': np.nan, 'g_statistic': np.nan, 'g_p_value': np.nan,
+                    'dof': max(dof, 0), 'cramers_v': np.nan, 'n': int(n), 'rows': n_rows, 'columns': n_cols}
+
+        expected = row_sums[table.row] * col_sums[table.col] / n
+        # Empty cells add (0 - E)^2 / E = E to the Pearson sum; summing O^2/E over
+        # non-empty cells and subtracting N accounts for all of them at once
+        chi2 = float(np.sum(observed ** 2 / expected) - n)
+        g = float(2 * np.sum(observed * np.log(observed / expected)))
+        return {
+            'chi2_statistic': chi2,
+            'p_value': float(stats.chi2.sf(chi2, dof)),
+            'g_statistic': g,
+            'g_p_value': float(stats.chi2.sf(g, dof)),
+            'dof': dof,
+            'cramers_v': float(np.sqrt(chi2 / (n * (min(n_rows, n_cols) - 1)))),
+            'n': int(n),
+            'rows': n_rows,
+            'columns': n_cols
+        }
+
+
+def claim_frequency_tables(chunks: Iterable[pd.DataFrame], dimensions: Sequence[str],
+                           claims_col: str = 'TotalClaims') -> Dict[str, SparseContingencyTable]:
+    """
+    One claim/no-claim contingency table per dimension, built in a single pass
+    over ``chunks``; dimensions missing from the data are skipped.
+    """
+    tables = {}
+    for chunk in chunks:
+        has_claim = pd.to_numeric(chunk[claims_col], errors='coerce').fillna(0).to_numpy() > 0
+        for dim in dimensions:
+            if dim in chunk.columns:
+                tables.setdefault(dim, SparseContingencyTable()).update(chunk[dim].to_numpy(), has_claim)
+    return tables
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence, Tuple
+
+DEFAULT_HIERARCHIES = [('Province', 'PostalCode'), ('VehicleType', 'make')]
+
+
+def segment_moments(df: pd.DataFrame, keys: Sequence[str], period_col: str = 'TransactionMonth') -> pd.DataFrame:
+    """
+    Per-segment moments needed by Bühlmann-Straub, from one grouped pass.
+
+    A segment's observations are its per-period loss ratios X_j = C_j / P_j,
+    weighted by premium P_j. Returned columns: ``weight`` (sum P_j),
+    ``claims`` (sum C_j), ``weighted_sq`` (sum P_j * X_j**2 = sum C_j**2 / P_j)
+    and ``periods`` (number of periods with positive premium).
+    """
+    periods = pd.to_datetime(df[period_col], errors='coerce').dt.to_period('M') if period_col in df.columns \
+        else pd.Series(0, index=df.index)
+    cells = (df.assign(_period=periods)
+               .groupby(list(keys) + ['_period'], observed=True)[['TotalPremium', 'TotalClaims']].sum())
+    cells = cells[cells['TotalPremium'] > 0]
+    cells['weighted_sq'] = cells['TotalClaims'] ** 2 / cells['TotalPremium']
+    moments = cells.groupby(level=list(range(len(keys))))[['TotalPremium', 'TotalClaims', 'weighted_sq']].sum()
+    moments['periods'] = cells.groupby(level=list(range(len(keys)))).size()
+    return moments.rename(columns={'TotalPremium': 'weight', 'TotalClaims': 'claims'})
+
+
+def buhlmann_straub(weight: np.ndarray, claims: np.ndarray, weighted_sq: np.ndarray, periods: np.ndarray,
+                    groups: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized Bühlmann-Straub variance components within ``groups``.
+
+    Segments are pooled into ``n_groups`` collectives (e.g. postal codes within
+    a province). Returns the expected process variance ``s2`` and the variance
+    of hypothetical means ``a`` per collective, and each segment's credibility
+    factor Z = w / (w + s2 / a).
+    """
+    mean = np.divide(claims, weight, out=np.zeros_like(weight), where=weight > 0)
+
+    # Expected process variance: within-segment dispersion across periods
+    within = np.maximum(weighted_sq - weight * mean ** 2, 0.0)
+    dof = np.bincount(groups, weights=np.maximum(periods - 1, 0), minlength=n_groups)
+    s2 = np.divide(np.bincount(groups, weights=within, minlength=n_groups), dof,
+                   out=np.zeros(n_groups), where=dof > 0)
+
+    # Variance of hypothetical means: between-segment dispersion beyond noise
+    group_weight = np.bincount(groups, weights=weight, minlength=n_groups)
+    group_mean = np.divide(np.bincount(groups, weights=claims, minlength=n_groups), group_weight,
+                           out=np.zeros(n_groups), where=group_weight > 0)
+    between = np.bincount(groups, weights=weight * (mean - group_mean[groups]) ** 2, minlength=n_groups)
+    n_segments = np.bincount(groups, minlength=n_groups)
+    denominator = group_weight - np.divide(np.bincount(groups, weights=weight ** 2, minlength=n_groups),
+                                           group_weight, out=np.zeros(n_groups), where=group_weight > 0)
+    a = np.divide(between - (n_segments - 1) * s2, denominator, out=np.zeros(n_groups), where=denominator > 0)
+    a = np.maximum(a, 0.0)
+
+    # Z = w / (w + s2/a); with no between-segment variance (a = 0) Z is 0
+    k = np.divide(s2, a, out=np.full(n_groups, np.inf), where=a > 0)[groups]
+    credible = np.isfinite(k)
+    z = np.zeros_like(weight)
+    z[credible] = weight[credible] / (weight[credible] + k[credible])
+    return s2, a, z
+
+
+class CredibilityEngine:
+    """
+    Credibility-weighted loss ratios for segment hierarchies.
+
+    For each hierarchy (Province -> PostalCode, VehicleType -> make) the parent
+    level is credibility-weighted against the book loss ratio, and each child
+    against its parent's credibility estimate, so a postal code with little
+    premium stays close to its province while a large one keeps its own
+    experience. Variance components are estimated per collective from
+    precomputed segment moments with array operations only.
+    """
+
+    def __init__(self, hierarchies: Sequence[Tuple[str, str]] = DEFAULT_HIERARCHIES,
+                 period_col: str = 'TransactionMonth', target_loss_ratio: float = 0.65):
+        self.hierarchies = list(hierarchies)
+        self.period_col = period_col
+        self.target_loss_ratio = target_loss_ratio
+
+    def fit(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Return one credibility table per hierarchy level, keyed by level column name."""
+        results = {}
+        for parent, child in self.hierarchies:
+            if parent not in df.columns or child not in df.columns:
+                continue
+            parent_table = self.credibility_table(segment_moments(df, [parent], self.period_col))
+            child_moments = segment_moments(df, [parent, child], self.period_col)
+            complement = parent_table['credibility_loss_ratio'].reindex(
+                child_moments.index.get_level_values(parent)).to_numpy()
+            results[parent] = parent_table
+            results[child] = self.credibility_table(child_moments, complement=complement,
+                                                    collectives=child_moments.index.get_level_values(parent))
+        return results
+
+    def credibility_table(self, moments: pd.DataFrame, complement=None, collectives=None) -> pd.DataFrame:
+        """
+        Credibility estimates for precomputed ``segment_moments``.
+
+        ``collectives`` groups segments for the variance components (default:
+        one collective); ``complement`` is each segment's prior (default: the
+        weighted mean of its collective).
+        """
+        weight = moments['weight'].to_numpy(dtype=float)
+        claims = moments['claims'].to_numpy(dtype=float)
+        if collectives is None:
+            groups, n_groups = np.zeros(len(moments), dtype=np.int64), 1
+        else:
+            groups, labels = pd.factorize(np.asarray(collectives))
+            n_groups = len(labels)
+        s2, a, z = buhlmann_straub(weight, claims, moments['weighted_sq'].to_numpy(dtype=float),
+                                   moments['periods'].to_numpy(dtype=float), groups, n_groups)
+
+        observed = np.divide(claims, weight, out=np.zeros_like(weight), where=weight > 0)
+        if complement is None:
+            group_weight = np.bincount(groups, weights=weight, minlength=n_groups)
+            complement = np.divide(np.bincount(groups, weights=claims, minlength=n_groups), group_weight,
+                                   out=np.zeros(n_groups), where=group_weight > 0)[groups]
+        complement = np.asarray(complement, dtype=float)
+        estimate = z * observed + (1 - z) * complement
+
+        table = moments[['weight', 'claims', 'periods']].copy()
+        table['observed_loss_ratio'] = observed
+        table['credibility'] = z
+        table['complement_loss_ratio'] = complement
+        table['credibility_loss_ratio'] = estimate
+        table['process_variance'] = s2[groups]
+        table['hypothetical_mean_variance'] = a[groups]
+        # Premium that would bring the segment to the target loss ratio
+        table['indicated_premium'] = weight * estimate / self.target_loss_ratio
+        return table
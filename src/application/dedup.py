@@ -0,0 +1,242 @@
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+DEFAULT_KEYS = ['UnderwrittenCoverID', 'PolicyID', 'TransactionMonth']
+KEEP_RULES = ['latest', 'first', 'last']
+
+# key fingerprint, row fingerprint, order value, source, row position
+_RECORD = np.dtype([('key', np.uint64), ('row', np.uint64), ('order', np.int64),
+                    ('source', np.int32), ('position', np.int64)])
+
+
+def fingerprint(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """
+    64-bit hash of ``columns`` for every row.
+
+    Numeric columns are hashed as float64, so the same value read as int from
+    one file and as float from another still fingerprints identically.
+    """
+    frame = df[list(columns)]
+    numeric = [c for c in frame.columns
+               if pd.api.types.is_numeric_dtype(frame[c]) and not pd.api.types.is_bool_dtype(frame[c])]
+    if numeric:
+        frame = frame.astype({c: float for c in numeric})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+@dataclass
+class DedupReport:
+    rows_in: int = 0
+    rows_out: int = 0
+    exact_duplicates: int = 0
+    key_conflicts: int = 0
+    duplicate_keys: int = 0
+    dropped_by_source: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def total_dropped(self) -> int:
+        return self.exact_duplicates + self.key_conflicts
+
+    def summary(self) -> pd.DataFrame:
+        """One row per source with the number of rows dropped from it."""
+        return pd.DataFrame({'dropped': pd.Series(self.dropped_by_source, dtype='int64')}).rename_axis('source')
+
+
+class Deduplicator:
+    """
+    Streaming reconciliation of overlapping sources.
+
+    Each row is reduced to a compact record: a 64-bit fingerprint of its key
+    columns, a fingerprint of the whole row, its ``order_col`` value and its
+    (source, position). Records are hash-partitioned on the key fingerprint
+    and spilled to disk once ``memory_budget_mb`` is exceeded; each partition
+    is then sorted on (key, order, source, position), which puts duplicates
+    side by side, and one row per key is kept according to ``keep``:
+
+    - ``last`` / ``first``: the last / first occurrence in source order
+    - ``latest``: the row with the latest ``order_col`` (e.g. TransactionMonth);
+      ties go to the later source, then the later row. Only meaningful for
+      keys coarser than a single month, so ``order_col`` must not be one of
+      ``keys`` (the default keys include TransactionMonth)
+
+    A dropped row is an exact duplicate when it matches the kept row on every
+    compared column, and a key conflict otherwise. Rows are compared on
+    ``compare_columns``; by default the columns all sources share, so a
+    source carrying extra columns still has its copies of another source's
+    rows counted as exact duplicates. Rows whose key columns are missing or
+    incomplete are only deduplicated against exact copies of themselves.
+    Only a keep/drop bit per input row is held after resolution, and the
+    second pass streams the sources again to emit the surviving rows.
+    """
+
+    def __init__(self, keys: Sequence[str] = DEFAULT_KEYS, order_col: Optional[str] = 'TransactionMonth',
+                 keep: str = 'last', memory_budget_mb: float = 256, n_partitions: int = 16,
+                 spill_dir: Optional[str] = None, compare_columns: Optional[Sequence[str]] = None):
+        if keep not in KEEP_RULES:
+            raise ValueError(f"Unknown keep rule '{keep}'. Available: {KEEP_RULES}")
+        if keep == 'latest' and order_col in keys:
+            raise ValueError(f"keep='latest' needs keys without '{order_col}'; every row sharing "
+                             f"these keys has the same {order_col}, so use keep='last'")
+        self.keys = list(keys)
+        self.order_col = order_col
+        self.keep = keep
+        self.compare_columns = sorted(compare_columns) if compare_columns is not None else None
+        self.n_partitions = n_partitions
+        self.max_records = max(1, int(memory_budget_mb * 1024 * 1024 / _RECORD.itemsize))
+        self._spill_root = spill_dir
+        self._spill_dir = None
+        self._spill_runs = 0
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+        self._rows: Dict[int, int] = {}
+        self._keep_masks: Dict[int, np.ndarray] = {}
+        self.report = DedupReport()
+
+    def run(self, sources: Sequence[Callable[[], Iterable[pd.DataFrame]]]) -> Iterator[pd.DataFrame]:
+        """
+        Deduplicate across ``sources`` and yield the surviving rows chunk by chunk.
+
+        Each source is a zero-argument callable returning an iterable of
+        chunks (e.g. ``lambda: loader.load_chunks(path)``); it is called twice,
+        plus once to read its first chunk's columns when ``compare_columns``
+        is not set.
+        """
+        if self.compare_columns is None:
+            self.compare_columns = self._shared_columns(sources)
+        try:
+            for source, chunks in enumerate(sources):
+                for chunk in chunks():
+                    self.add(chunk, source)
+            self.resolve()
+        finally:
+            self.close()
+        for source, chunks in enumerate(sources):
+            offset = 0
+            for chunk in chunks():
+                yield self.filter(chunk, source, offset)
+                offset += len(chunk)
+
+    def add(self, chunk: pd.DataFrame, source: int):
+        """Record the fingerprints of one chunk of ``source`` (first pass)."""
+        n = len(chunk)
+        start = self._rows.get(source, 0)
+        self._rows[source] = start + n
+        if n == 0:
+            return
+
+        compared = [c for c in self.compare_columns or [] if c in chunk.columns]
+        row_fp = fingerprint(chunk, compared or sorted(chunk.columns))
+        keys = [k for k in self.keys if k in chunk.columns]
+        if keys:
+            key_fp = fingerprint(chunk, keys)
+            incomplete = chunk[keys].isna().any(axis=1).to_numpy() if len(keys) == len(self.keys) \
+                else np.ones(n, dtype=bool)
+            key_fp = np.where(incomplete, row_fp, key_fp)
+        else:
+            key_fp = row_fp
+
+        records = np.empty(n, dtype=_RECORD)
+        records['key'] = key_fp
+        records['row'] = row_fp
+        records['order'] = self._order_values(chunk)
+        records['source'] = source
+        records['position'] = np.arange(start, start + n)
+        self._buffer.append(records)
+        self._buffered += n
+        if self._buffered > self.max_records:
+            self._spill()
+
+    def resolve(self) -> DedupReport:
+        """Pick the surviving row of every key; returns the report."""
+        self._keep_masks = {source: np.zeros(n, dtype=bool) for source, n in self._rows.items()}
+        report = DedupReport(rows_in=sum(self._rows.values()))
+        for records in self._iter_partitions():
+            self._resolve_partition(records, report)
+        report.rows_out = int(sum(mask.sum() for mask in self._keep_masks.values()))
+        report.dropped_by_source = {source: int((~mask).sum()) for source, mask in self._keep_masks.items()}
+        self.report = report
+        return report
+
+    def filter(self, chunk: pd.DataFrame, source: int, offset: int) -> pd.DataFrame:
+        """Surviving rows of a chunk that starts at row ``offset`` of ``source`` (second pass)."""
+        return chunk[self._keep_masks[source][offset:offset + len(chunk)]]
+
+    def close(self):
+        """Remove spill files."""
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _shared_columns(self, sources) -> List[str]:
+        """Columns present in the first chunk of every source."""
+        shared = None
+        for chunks in sources:
+            iterator = iter(chunks())
+            first = next(iterator, None)
+            if hasattr(iterator, 'close'):
+                # Stop a streaming reader after its first chunk
+                iterator.close()
+            if first is not None:
+                shared = set(first.columns) if shared is None else shared & set(first.columns)
+        return sorted(shared or [])
+
+    def _order_values(self, chunk: pd.DataFrame) -> np.ndarray:
+        if self.keep != 'latest' or not self.order_col or self.order_col not in chunk.columns:
+            return np.zeros(len(chunk), dtype=np.int64)
+        # NaT becomes the smallest int64, so rows without a date never win over dated ones
+        return pd.to_datetime(chunk[self.order_col], errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    def _resolve_partition(self, records: np.ndarray, report: DedupReport):
+        order = np.lexsort((records['position'], records['source'], records['order'], records['key']))
+        records = records[order]
+        keys = records['key']
+        # Sorted so each key's rows are contiguous; the winner is the last (or first) of its run
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(records)] - 1
+        winners = starts if self.keep == 'first' else ends
+
+        for source in np.unique(records['source'][winners]):
+            won = winners[records['source'][winners] == source]
+            self._keep_masks[int(source)][records['position'][won]] = True
+
+        sizes = ends - starts + 1
+        winner_row = np.repeat(records['row'][winners], sizes)
+        dropped = np.ones(len(records), dtype=bool)
+        dropped[winners] = False
+        exact = int(np.count_nonzero(dropped & (records['row'] == winner_row)))
+        report.exact_duplicates += exact
+        report.key_conflicts += int(np.count_nonzero(dropped)) - exact
+        report.duplicate_keys += int(np.count_nonzero(sizes > 1))
+
+    def _iter_partitions(self) -> Iterator[np.ndarray]:
+        """Yield all records one key partition at a time."""
+        if not self._spill_runs:
+            if self._buffer:
+                yield np.concatenate(self._buffer)
+            return
+        self._spill()
+        for p in range(self.n_partitions):
+            files = [os.path.join(self._spill_dir, f) for f in sorted(os.listdir(self._spill_dir))
+                     if f.startswith(f'part-{p:03d}-')]
+            if files:
+                yield np.concatenate([np.load(path) for path in files])
+
+    def _spill(self):
+        """Write buffered records to disk, one file per key partition."""
+        if not self._buffer:
+            return
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='dedup_spill_', dir=self._spill_root)
+        records = np.concatenate(self._buffer)
+        partitions = records['key'] % np.uint64(self.n_partitions)
+        for p in np.unique(partitions):
+            np.save(os.path.join(self._spill_dir, f'part-{int(p):03d}-{self._spill_runs:05d}.npy'),
+                    records[partitions == p])
+        self._spill_runs += 1
+        self._buffer = []
+        self._buffered = 0
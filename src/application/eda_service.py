@@ -1,52 +1,220 @@
-from src.application.interfaces import IDataLoader, IPlotter
+from src.application.interfaces import IDataLoader, IPlotter, IResultCache
+from src.application.memoization import file_fingerprint, memoize, result_key
+from src.application.validation import SchemaValidator
 import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Feature modules are imported by the methods that use them, so a plain
+    # EDA run does not load scipy or the engines it never touches
+    from src.application.olap_cube import LossCube
+    from src.application.sampling import StratifiedSampleStore
+    from src.application.time_series import RollingSegmentSeries
+
+CATEGORY_COLUMNS = ['Province', 'VehicleType', 'Gender']
+AMOUNT_COLUMNS = ['TotalPremium', 'TotalClaims']
 
 class EDAService:
-    def __init__(self, data_loader: IDataLoader, plotter: IPlotter):
+    def __init__(self, data_loader: IDataLoader, plotter: IPlotter,
+                 sample_store: 'StratifiedSampleStore' = None, result_cache: IResultCache = None):
         self.data_loader = data_loader
         self.plotter = plotter
+        self.sample_store = sample_store
+        self.result_cache = result_cache
+        self.validation_report = None
+
+    def perform_initial_analysis(self, file_path: str, pipelined: bool = False, chunksize: int = 100_000):
+        """
+        Run the loss-ratio EDA on a dataset.
+
+        With ``pipelined=True`` the file is streamed in chunks: the loader parses
+        the next chunk in the background while the current one is cleaned and
+        aggregated, and only the partial aggregates are combined at the end.
+
+        Declared columns are coerced by a SchemaValidator; counts and sample
+        row numbers of rejected values are kept in ``self.validation_report``.
 
-    def perform_initial_analysis(self, file_path: str):
-        df = self.data_loader.load_data(file_path)
+        The result is not memoized: the outlier plots and the returned frame
+        need every row, so a cached run would still read the whole file.
+        """
+        df, aggregates, self.validation_report = self._load_and_aggregate(file_path, pipelined, chunksize)
         print(f"Loaded data with shape: {df.shape}")
-        
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        
-        # Data Cleaning & Conversion
-        try:
-            df['TotalPremium'] = pd.to_numeric(df['TotalPremium'], errors='coerce')
-            df['TotalClaims'] = pd.to_numeric(df['TotalClaims'], errors='coerce')
-            if 'TransactionMonth' in df.columns:
-                df['TransactionMonth'] = pd.to_datetime(df['TransactionMonth'], errors='coerce')
-        except Exception as e:
-            print(f"Error cleaning data: {e}")
-            raise
+        if self.validation_report.total_rejected:
+            print(f"Rejected values by column:\n{self.validation_report.summary()}")
 
         # 1. Overall Loss Ratio
-        total_premium = df['TotalPremium'].sum()
-        total_claims = df['TotalClaims'].sum()
+        total_premium, total_claims = aggregates['totals']
         loss_ratio = total_claims / total_premium if total_premium > 0 else 0
         print(f"Overall Loss Ratio: {loss_ratio:.2%}")
 
         # 2. Loss Ratio by Categories
         print("Analyzing Loss Ratio by Categories...")
-        for col in ['Province', 'VehicleType', 'Gender']:
-            if col in df.columns:
-                group = df.groupby(col)[['TotalPremium', 'TotalClaims']].sum()
+        for col in CATEGORY_COLUMNS:
+            if col in aggregates:
+                group = aggregates[col]
                 group['LossRatio'] = group['TotalClaims'] / group['TotalPremium']
                 print(f"\nLoss Ratio by {col}:\n{group['LossRatio']}")
                 self.plotter.plot_bar(group.reset_index(), col, 'LossRatio', f'Loss Ratio by {col}')
 
         # 3. Temporal Trends
-        if 'TransactionMonth' in df.columns:
+        if 'TransactionMonth' in aggregates:
             print("\nAnalyzing Temporal Trends...")
-            monthly = df.groupby('TransactionMonth')[['TotalPremium', 'TotalClaims']].sum().reset_index()
-            self.plotter.plot_time_series(monthly, 'TransactionMonth', ['TotalPremium', 'TotalClaims'])
+            monthly = aggregates['TransactionMonth'].reset_index()
+            self.plotter.plot_time_series(monthly, 'TransactionMonth', AMOUNT_COLUMNS)
 
         # 4. Outliers
         print("\nGenerating Outlier Plots...")
         self.plotter.plot_boxplot(df, 'TotalClaims')
         self.plotter.plot_boxplot(df, 'TotalPremium')
+        self.plotter.flush()
 
         return df
+
+    def top_risk_segments(self, file_path: str, key: str = 'PostalCode', k: int = 10,
+                          min_premium: float = 0.0, chunksize: int = 100_000,
+                          memory_budget_mb: float = 256) -> pd.DataFrame:
+        """
+        Highest loss-ratio values of a high-cardinality key (PostalCode, make).
+
+        The file is streamed chunk by chunk into a HighCardinalityGroupBy, which
+        spills to disk if the key space outgrows ``memory_budget_mb``.
+        """
+        from src.application.groupby_engine import HighCardinalityGroupBy
+
+        engine = HighCardinalityGroupBy(key, AMOUNT_COLUMNS, memory_budget_mb=memory_budget_mb)
+        try:
+            for chunk in self.data_loader.load_chunks(file_path, chunksize):
+                chunk.columns = chunk.columns.str.strip()
+                engine.update(chunk)
+            top = engine.top_k(k, by='LossRatio', min_premium=min_premium)
+        finally:
+            engine.close()
+        print(f"\nTop {k} {key} values by Loss Ratio:\n{top['LossRatio']}")
+        return top
+
+    def estimate_loss_ratio(self, file_path: str, by: str = None, approximate: bool = False,
+                            max_relative_error: float = 0.05, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Loss ratio overall or per ``by`` group, with confidence intervals.
+
+        With ``approximate=True`` the answer comes from the stratified sample
+        store; if no store is configured or any interval is wider than
+        ``max_relative_error`` of its estimate, the file is scanned exactly.
+        """
+        from src.application.sampling import approximate_estimates, exact_estimates
+
+        if approximate:
+            frame = approximate_estimates(self.sample_store, 'TotalClaims', by, 'TotalPremium',
+                                          max_relative_error, confidence)
+            if frame is not None:
+                return frame
+            print("Sample store cannot meet the requested precision; scanning the full data...")
+
+        def compute():
+            df = SchemaValidator().validate(self.data_loader.load_data(file_path))
+            return exact_estimates(df, 'TotalClaims', by, 'TotalPremium')
+
+        key = result_key('EDAService.estimate_loss_ratio', file_fingerprint(file_path), by=by)
+        return memoize(self.result_cache, key, compute)
+
+    def compute_trends(self, df: pd.DataFrame, segment_col: str = None, windows=(3, 12),
+                       series: 'RollingSegmentSeries' = None) -> 'RollingSegmentSeries':
+        """
+        Rolling/cumulative loss ratios and month-over-month premium growth,
+        overall or per ``segment_col`` (e.g. Province).
+
+        Pass the ``series`` from a previous call to append only the new months.
+        """
+        from src.application.time_series import RollingSegmentSeries
+
+        series = series if series is not None else RollingSegmentSeries(windows)
+        return series.append_frame(df, segment_col)
+
+    def credibility_loss_ratios(self, file_path: str, target_loss_ratio: float = 0.65) -> dict:
+        """
+        Credibility-weighted loss ratios for Province -> PostalCode and
+        VehicleType -> make, one table per level.
+        """
+        from src.application.credibility import CredibilityEngine
+
+        def compute():
+            df = SchemaValidator().validate(self.data_loader.load_data(file_path))
+            return CredibilityEngine(target_loss_ratio=target_loss_ratio).fit(df)
+
+        key = result_key('EDAService.credibility_loss_ratios', file_fingerprint(file_path),
+                         target_loss_ratio=target_loss_ratio)
+        return memoize(self.result_cache, key, compute)
+
+    def build_cube(self, file_path: str, cube: 'LossCube' = None, chunksize: int = 100_000) -> 'LossCube':
+        """
+        Fold a dataset into a LossCube, streaming it in chunks.
+
+        Pass an existing ``cube`` to add a newly arrived month to it instead of
+        rebuilding from the full history.
+        """
+        from src.application.olap_cube import LossCube
+
+        cube = cube if cube is not None else LossCube()
+        for chunk in self.data_loader.load_chunks(file_path, chunksize):
+            chunk.columns = chunk.columns.str.strip()
+            cube.update(chunk)
+        return cube
+
+    def _load_and_aggregate(self, file_path: str, pipelined: bool, chunksize: int):
+        """Cleaned rows, their aggregates and the validation report."""
+        validator = SchemaValidator()
+        self.validation_report = validator.report
+        if pipelined:
+            parts = []
+            partials = []
+            for chunk in self.data_loader.load_chunks(file_path, chunksize):
+                chunk = self._clean(chunk, validator)
+                partials.append(self._aggregate(chunk))
+                # Standalone column copies, so each can be freed on its own while stacking
+                parts.append({col: chunk[col].copy() for col in chunk.columns})
+            df = self._stack_columns(parts)
+            aggregates = self._combine(partials)
+        else:
+            df = self._clean(self.data_loader.load_data(file_path), validator)
+            aggregates = self._aggregate(df)
+        return df, aggregates, validator.report
+
+    def _stack_columns(self, parts: list) -> pd.DataFrame:
+        """
+        Stack per-chunk columns into one frame a column at a time. Each column
+        is dropped from the chunks as soon as it is copied, so peak memory is
+        one copy of the data plus one column rather than two copies.
+        """
+        columns = {}
+        for col in list(parts[0]):
+            columns[col] = pd.concat([part.pop(col) for part in parts], ignore_index=True)
+        return pd.DataFrame(columns, copy=False)
+
+    def _clean(self, df: pd.DataFrame, validator: SchemaValidator) -> pd.DataFrame:
+        # Clean column names and coerce the typed columns in one validation pass
+        try:
+            df = validator.validate(df)
+        except Exception as e:
+            print(f"Error cleaning data: {e}")
+            raise
+        if validator.report.missing_columns:
+            missing = ', '.join(validator.report.missing_columns)
+            print(f"Error cleaning data: missing required column(s) {missing}")
+            raise KeyError(missing)
+        return df
+
+    def _aggregate(self, df: pd.DataFrame) -> dict:
+        """Premium/claims sums overall, per category and per month."""
+        aggregates = {'totals': (df['TotalPremium'].sum(), df['TotalClaims'].sum())}
+        for col in CATEGORY_COLUMNS + ['TransactionMonth']:
+            if col in df.columns:
+                aggregates[col] = df.groupby(col)[AMOUNT_COLUMNS].sum()
+        return aggregates
+
+    def _combine(self, partials: list) -> dict:
+        """Merge per-chunk aggregates; sums are additive so this is exact."""
+        combined = {'totals': tuple(sum(p['totals'][i] for p in partials) for i in range(2))}
+        for key in partials[0]:
+            if key != 'totals':
+                combined[key] = pd.concat([p[key] for p in partials]).groupby(level=0).sum()
+        return combined
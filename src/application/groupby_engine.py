@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Iterator, List, Optional, Sequence
+
+# Rough per-key footprint: one float64 per accumulator plus the dictionary entry
+_DICT_ENTRY_BYTES = 120
+
+
+class KeyEncoder:
+    """
+    Incremental dictionary encoder mapping key values to dense integer codes.
+
+    Only the distinct values of each chunk go through the Python dictionary;
+    rows are mapped with a vectorized take, so encoding cost is dominated by
+    ``pd.factorize`` rather than per-row hashing in Python.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key, default=None):
+        """Code of an already-seen key, or ``default``."""
+        return self._codes.get(key, default)
+
+    def encode(self, values) -> np.ndarray:
+        """Return the int64 code of every value; missing values get -1."""
+        codes, uniques = pd.factorize(np.asarray(values))
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques.tolist()):
+            code = self._codes.get(key)
+            if code is None:
+                code = self._codes[key] = len(self.keys)
+                self.keys.append(key)
+            mapping[i] = code
+        return np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1) if len(mapping) else codes.astype(np.int64)
+
+
+class HighCardinalityGroupBy:
+    """
+    Sum/count aggregation over a high-cardinality key (PostalCode, make).
+
+    Keys are dictionary-encoded once and rows are aggregated into integer-indexed
+    arrays with ``np.bincount``. When the number of distinct keys would exceed
+    ``memory_budget_mb``, the partial aggregates are hash-partitioned and spilled
+    to disk; each partition is merged independently at the end, so no more than
+    one partition's keys are held in memory at a time.
+    """
+
+    def __init__(self, key: str, value_cols: Sequence[str] = ('TotalPremium', 'TotalClaims'),
+                 memory_budget_mb: float = 256, n_partitions: int = 16, spill_dir: Optional[str] = None):
+        self.key = key
+        self.value_cols = list(value_cols)
+        self.n_partitions = n_partitions
+        self.max_keys = max(1, int(memory_budget_mb * 1024 * 1024 /
+                                   (8 * (len(self.value_cols) + 1) + _DICT_ENTRY_BYTES)))
+        self._spill_root = spill_dir
+        self._spill_dir = None
+        self._spill_runs = 0
+        self._reset()
+
+    def _reset(self):
+        self._encoder = KeyEncoder()
+        self._sums = np.zeros((len(self.value_cols), 0))
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_runs > 0
+
+    def update(self, df: pd.DataFrame):
+        """Fold one chunk of rows into the running aggregates."""
+        codes = self._encoder.encode(df[self.key].to_numpy())
+        valid = codes >= 0
+        codes = codes[valid]
+        n_keys = len(self._encoder)
+
+        if n_keys > self._counts.shape[0]:
+            grow = n_keys - self._counts.shape[0]
+            self._sums = np.pad(self._sums, ((0, 0), (0, grow)))
+            self._counts = np.pad(self._counts, (0, grow))
+
+        self._counts += np.bincount(codes, minlength=n_keys)
+        for i, col in enumerate(self.value_cols):
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)[valid]
+            self._sums[i] += np.bincount(codes, weights=np.nan_to_num(values), minlength=n_keys)
+
+        if n_keys > self.max_keys:
+            self._spill()
+        return self
+
+    def iter_partitions(self) -> Iterator[pd.DataFrame]:
+        """Yield the final aggregates one hash partition at a time."""
+        if not self.spilled:
+            yield self._frame(self._encoder.keys, self._sums, self._counts)
+            return
+
+        self._spill()
+        for p in range(self.n_partitions):
+            files = [os.path.join(self._spill_dir, f) for f in sorted(os.listdir(self._spill_dir))
+                     if f.startswith(f'part-{p:03d}-')]
+            if files:
+                yield self._merge_partition(files)
+
+    def result(self) -> pd.DataFrame:
+        """Full result indexed by key, with sums, row counts and LossRatio."""
+        parts = list(self.iter_partitions())
+        return pd.concat(parts) if parts else self._frame([], self._sums[:, :0], self._counts[:0])
+
+    def top_k(self, k: int, by: str = 'LossRatio', min_premium: float = 0.0) -> pd.DataFrame:
+        """
+        The ``k`` keys with the highest ``by`` value, without sorting the full result.
+
+        Keys whose premium is at most ``min_premium`` are skipped so that tiny,
+        noisy segments do not crowd out the ranking.
+        """
+        candidates = []
+        for part in self.iter_partitions():
+            if 'TotalPremium' in part.columns:
+                part = part[part['TotalPremium'] > min_premium]
+            candidates.append(self._largest(part, k, by))
+        if not candidates:
+            return pd.DataFrame()
+        best = self._largest(pd.concat(candidates), k, by)
+        return best.sort_values(by, ascending=False)
+
+    def close(self):
+        """Remove spill files."""
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _largest(self, frame: pd.DataFrame, k: int, by: str) -> pd.DataFrame:
+        scores = frame[by].to_numpy(dtype=float)
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        if len(scores) <= k:
+            return frame
+        return frame.iloc[np.argpartition(-scores, k - 1)[:k]]
+
+    def _merge_partition(self, files: List[str]) -> pd.DataFrame:
+        """Re-aggregate the spilled partial aggregates of one partition."""
+        partials = pd.concat([pd.read_pickle(path) for path in files], ignore_index=True)
+        encoder = KeyEncoder()
+        codes = encoder.encode(partials[self.key].to_numpy())
+        n_keys = len(encoder)
+        sums = np.vstack([np.bincount(codes, weights=partials[col].to_numpy(dtype=float), minlength=n_keys)
+                          for col in self.value_cols])
+        counts = np.bincount(codes, weights=partials['count'].to_numpy(dtype=float), minlength=n_keys)
+        return self._frame(encoder.keys, sums, counts.astype(np.int64))
+
+    def _frame(self, keys: List, sums: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        frame = pd.DataFrame({col: sums[i] for i, col in enumerate(self.value_cols)},
+                             index=pd.Index(keys, name=self.key))
+        frame['count'] = counts
+        if 'TotalPremium' in frame.columns and 'TotalClaims' in frame.columns:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frame['LossRatio'] = frame['TotalClaims'] / frame['TotalPremium']
+        return frame
+
+    def _spill(self):
+        """Write the current partial aggregates to disk, one file per hash partition."""
+        if len(self._encoder) == 0:
+            return
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='groupby_spill_', dir=self._spill_root)
+
+        keys = self._encoder.keys
+        partial = pd.DataFrame({col: self._sums[i] for i, col in enumerate(self.value_cols)})
+        partial.insert(0, self.key, pd.Series(keys, dtype=object))
+        partial['count'] = self._counts
+        # Python's hash treats 1000 and 1000.0 alike, so a key always lands in one partition
+        partitions = np.fromiter((hash(key) for key in keys), dtype=np.int64, count=len(keys)) % self.n_partitions
+        for p in np.unique(partitions):
+            path = os.path.join(self._spill_dir, f'part-{p:03d}-{self._spill_runs:05d}.pkl')
+            partial[partitions == p].to_pickle(path)
+
+        self._spill_runs += 1
+        self._reset()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 
 class IDataLoader(ABC):
@@ -6,6 +7,10 @@ class IDataLoader(ABC):
     def load_data(self, file_path: str) -> pd.DataFrame:
         pass
 
+    def load_chunks(self, file_path: str, chunksize: int = 100_000):
+        """Yield the dataset in chunks. Loaders without streaming support yield it whole."""
+        yield self.load_data(file_path)
+
 class IPlotter(ABC):
     @abstractmethod
     def plot_distribution(self, data: pd.DataFrame, column: str):
@@ -26,3 +31,31 @@ class IPlotter(ABC):
     @abstractmethod
     def plot_time_series(self, data: pd.DataFrame, date_col: str, value_cols: list):
         pass
+
+    def flush(self):
+        """Wait for any figures still being written in the background."""
+        pass
+
+    def close(self):
+        """Finish pending figures and release background resources."""
+        self.flush()
+
+class IModelStore(ABC):
+    @abstractmethod
+    def save(self, name: str, model: Any, metadata: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    def load(self, name: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Return ``(model, metadata)`` for ``name``, or None if nothing is stored."""
+        pass
+
+class IResultCache(ABC):
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` on a miss."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        pass
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Optional
+
+from src.application.interfaces import IResultCache
+
+_MISSING = object()
+
+
+def file_fingerprint(file_path: str) -> Optional[str]:
+    """
+    Identify a file's contents by path, size and modification time, without
+    reading it. Returns None when the path is not a local file (nothing is
+    cached then).
+    """
+    try:
+        stat = os.stat(file_path)
+    except (OSError, TypeError):
+        return None
+    return f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def result_key(method: str, fingerprint: Optional[str], **params) -> Optional[str]:
+    """Cache key for ``method`` applied to the fingerprinted data with ``params``."""
+    if fingerprint is None:
+        return None
+    payload = json.dumps({'method': method, 'data': fingerprint, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def memoize(cache: Optional[IResultCache], key: Optional[str], compute: Callable[[], Any]) -> Any:
+    """Return the cached result for ``key``, computing and storing it on a miss."""
+    if cache is None or key is None:
+        return compute()
+    # A sentinel rather than None marks a miss, so a cached None is still a hit
+    result = cache.get(key, _MISSING)
+    if result is _MISSING:
+        result = compute()
+        cache.set(key, result)
+    return result
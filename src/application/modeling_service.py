@@ -0,0 +1,244 @@
+import copy
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from src.application.glm import DEFAULT_FACTORS, FrequencySeverityGLM, SparseGLM
+from src.application.interfaces import IDataLoader, IModelStore
+
+try:
+    from xgboost import XGBRegressor
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+
+REGIONS = ['northeast', 'northwest', 'southeast', 'southwest']
+FEATURE_COLUMNS = ['age', 'bmi', 'children', 'smoker_encoded', 'sex_encoded', 'smoker_bmi', 'age_smoker'] + \
+                  [f'region_{r}' for r in REGIONS]
+TARGET_COLUMN = 'charges'
+RISK_TIERS = ['Low', 'Medium', 'High']
+TIER_QUANTILES = [0.5, 0.8]
+MODEL_TYPES = ['random_forest', 'xgboost', 'sgd']
+
+
+def prepare_features(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[pd.Series]]:
+    """
+    Feature matrix and target as in the modeling notebook (the target is None
+    for rows being scored, which have no ``charges``).
+
+    Region dummies are built against the fixed ``REGIONS`` list rather than
+    ``get_dummies`` so a monthly delta that lacks a region still produces the
+    columns the persisted model was trained on.
+    """
+    smoker = (df['smoker'] == 'yes').astype(int)
+    X = pd.DataFrame({
+        'age': df['age'],
+        'bmi': df['bmi'],
+        'children': df['children'],
+        'smoker_encoded': smoker,
+        'sex_encoded': (df['sex'] == 'male').astype(int),
+        'smoker_bmi': smoker * df['bmi'],
+        'age_smoker': smoker * df['age']
+    }, index=df.index)
+    for region in REGIONS:
+        X[f'region_{region}'] = (df['region'] == region).astype(int)
+    y = df[TARGET_COLUMN].astype(float) if TARGET_COLUMN in df.columns else None
+    return X[FEATURE_COLUMNS].astype(float), y
+
+
+class ScaledSGDRegressor:
+    """
+    Standardized linear model that can keep learning with ``partial_fit``.
+
+    The scaler is fitted on the first batch and then frozen: the learned
+    coefficients live in that scaled space, so re-centering it on later
+    batches would silently change what the existing weights mean.
+    """
+
+    def __init__(self, random_state: int = 42):
+        self.scaler = StandardScaler()
+        self.model = SGDRegressor(learning_rate='adaptive', eta0=0.01, random_state=random_state)
+
+    def partial_fit(self, X, y, epochs: int = 20):
+        if not hasattr(self.scaler, 'mean_'):
+            self.scaler.fit(X)
+        X_scaled = self.scaler.transform(X)
+        for _ in range(epochs):
+            self.model.partial_fit(X_scaled, y)
+        return self
+
+    def fit(self, X, y):
+        return self.partial_fit(X, y)
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+
+def _new_model(model_type: str, n_estimators: int):
+    if model_type == 'random_forest':
+        return RandomForestRegressor(n_estimators=n_estimators, max_depth=10, random_state=42, n_jobs=-1)
+    if model_type == 'xgboost':
+        if not XGBOOST_AVAILABLE:
+            raise ImportError("XGBoost not installed. Run: pip install xgboost")
+        return XGBRegressor(n_estimators=n_estimators, max_depth=6, learning_rate=0.1,
+                            random_state=42, verbosity=0)
+    if model_type == 'sgd':
+        return ScaledSGDRegressor()
+    raise ValueError(f"Unknown model type '{model_type}'. Available: {MODEL_TYPES}")
+
+
+def _warm_start(model, model_type: str, X, y, extra_estimators: int):
+    """Continue training a copy of ``model`` on the new rows only."""
+    if model_type == 'random_forest':
+        # Existing trees are kept; only the added trees see the new rows
+        candidate = copy.deepcopy(model)
+        candidate.set_params(warm_start=True, n_estimators=model.n_estimators + extra_estimators)
+        return candidate.fit(X, y)
+    if model_type == 'xgboost':
+        # Additional boosting rounds on top of the persisted booster
+        candidate = _new_model(model_type, extra_estimators)
+        return candidate.fit(X, y, xgb_model=model.get_booster())
+    candidate = copy.deepcopy(model)
+    return candidate.partial_fit(X, y)
+
+
+def _score(model, X, y) -> Dict[str, float]:
+    predictions = model.predict(X)
+    return {
+        'rmse': float(np.sqrt(mean_squared_error(y, predictions))),
+        'r2': float(r2_score(y, predictions))
+    }
+
+
+class ModelingService:
+    """
+    Trains the charges models and keeps them current.
+
+    ``train`` fits from scratch on the full history; ``update`` warm-starts
+    the persisted model on newly arrived rows only (extra trees, extra
+    boosting rounds or ``partial_fit``), so retrain cost scales with the
+    delta. The updated model replaces the stored one only if its holdout
+    RMSE has not drifted more than ``drift_tolerance`` above the current
+    model's on the same holdout.
+    """
+
+    def __init__(self, model_store: IModelStore, data_loader: Optional[IDataLoader] = None,
+                 drift_tolerance: float = 0.05):
+        self.model_store = model_store
+        self.data_loader = data_loader
+        self.drift_tolerance = drift_tolerance
+
+    def train(self, df: pd.DataFrame, model_type: str = 'random_forest', n_estimators: int = 100,
+              holdout: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Full fit on ``df``; the result is always promoted."""
+        start = time.perf_counter()
+        train_df, holdout = self._split(df, holdout)
+        X, y = prepare_features(train_df)
+        model = _new_model(model_type, n_estimators).fit(X, y)
+        metrics = _score(model, *prepare_features(holdout))
+        metadata = {
+            'model_type': model_type,
+            'rows_trained': len(train_df),
+            'updates': 0,
+            'holdout_rmse': metrics['rmse'],
+            # Charge levels separating the risk tiers used when re-rating the book
+            'tier_bounds': [float(q) for q in np.quantile(y, TIER_QUANTILES)],
+            'trained_at': datetime.now().isoformat()
+        }
+        self.model_store.save(model_type, model, metadata)
+        return {**metadata, 'holdout_r2': metrics['r2'], 'promoted': True,
+                'seconds': time.perf_counter() - start}
+
+    def update(self, new_rows: pd.DataFrame, model_type: str = 'random_forest', extra_estimators: int = 20,
+               holdout: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Warm-start the stored model on ``new_rows`` and promote it if it passes
+        the holdout drift check. Without a stored model this falls back to
+        ``train``. When no ``holdout`` is given, 20% of the new rows are held out.
+        """
+        stored = self.model_store.load(model_type)
+        if stored is None:
+            return self.train(new_rows, model_type, holdout=holdout)
+        model, metadata = stored
+
+        start = time.perf_counter()
+        train_df, holdout = self._split(new_rows, holdout)
+        X, y = prepare_features(train_df)
+        candidate = _warm_start(model, model_type, X, y, extra_estimators)
+
+        X_holdout, y_holdout = prepare_features(holdout)
+        current = _score(model, X_holdout, y_holdout)
+        updated = _score(candidate, X_holdout, y_holdout)
+        drift = updated['rmse'] / current['rmse'] - 1 if current['rmse'] else 0.0
+        promoted = drift <= self.drift_tolerance
+
+        if promoted:
+            metadata = {
+                **metadata,
+                'rows_trained': metadata.get('rows_trained', 0) + len(train_df),
+                'updates': metadata.get('updates', 0) + 1,
+                'holdout_rmse': updated['rmse'],
+                'trained_at': datetime.now().isoformat()
+            }
+            self.model_store.save(model_type, candidate, metadata)
+        return {
+            **metadata,
+            'rows_updated': len(train_df),
+            'current_rmse': current['rmse'],
+            'candidate_rmse': updated['rmse'],
+            'holdout_r2': updated['r2'],
+            'drift': drift,
+            'promoted': promoted,
+            'seconds': time.perf_counter() - start
+        }
+
+    def update_from_file(self, file_path: str, model_type: str = 'random_forest',
+                         extra_estimators: int = 20) -> Dict[str, Any]:
+        """``update`` with the new rows read through the data loader."""
+        if self.data_loader is None:
+            raise ValueError("A data loader is required to update from a file")
+        return self.update(self.data_loader.load_data(file_path), model_type, extra_estimators)
+
+    def fit_pricing_glm(self, df: pd.DataFrame, structure: str = 'tweedie', factors=DEFAULT_FACTORS,
+                        exposure: Optional[str] = None, alpha: float = 1e-4) -> Dict[str, pd.DataFrame]:
+        """
+        Fit a pure-premium GLM on policy rows (TotalClaims) and store it as
+        ``glm_<structure>``; returns the relativity table of every factor.
+
+        ``structure`` is ``tweedie`` (one model on pure premium) or
+        ``frequency_severity`` (Poisson frequency x Gamma severity).
+        """
+        start = time.perf_counter()
+        if structure == 'tweedie':
+            model = SparseGLM('tweedie', alpha=alpha).fit(df, 'TotalClaims', factors, exposure=exposure)
+        elif structure == 'frequency_severity':
+            model = FrequencySeverityGLM(alpha=alpha).fit(df, 'TotalClaims', factors, exposure=exposure)
+        else:
+            raise ValueError(f"Unknown GLM structure '{structure}'. Available: ['tweedie', 'frequency_severity']")
+        self.model_store.save(f'glm_{structure}', model, {
+            'model_type': f'glm_{structure}',
+            'rows_trained': len(df),
+            'factors': [f for f in factors if f in df.columns],
+            'seconds': time.perf_counter() - start,
+            'trained_at': datetime.now().isoformat()
+        })
+        return model.relativities()
+
+    def predict(self, df: pd.DataFrame, model_type: str = 'random_forest') -> np.ndarray:
+        stored = self.model_store.load(model_type)
+        if stored is None:
+            raise ValueError(f"No trained '{model_type}' model in the store")
+        X, _ = prepare_features(df)
+        return stored[0].predict(X)
+
+    def _split(self, df: pd.DataFrame, holdout: Optional[pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if holdout is not None:
+            return df, holdout
+        return train_test_split(df, test_size=0.2, random_state=42)
@@ -0,0 +1,154 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from src.application.groupby_engine import KeyEncoder
+
+CUBE_DIMENSIONS = ['Province', 'VehicleType', 'Gender', 'TransactionMonth']
+CUBE_MEASURES = ['TotalPremium', 'TotalClaims']
+MISSING_LABEL = 'Unknown'
+
+
+class LossCube:
+    """
+    Materialized premium/claims cube over Province x VehicleType x Gender x Month.
+
+    Every cell holds the row count and the sum and sum of squares of each
+    measure, which is enough to answer totals, means, standard deviations and
+    loss ratios for any roll-up or slice without touching the raw rows. New
+    rows (e.g. a newly arrived month) are folded in with ``update``; dimensions
+    grow as unseen members appear.
+    """
+
+    def __init__(self, dimensions: Sequence[str] = CUBE_DIMENSIONS,
+                 measures: Sequence[str] = CUBE_MEASURES):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self._encoders = {dim: KeyEncoder() for dim in self.dimensions}
+        shape = (0,) * len(self.dimensions)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.sums = np.zeros((len(self.measures),) + shape)
+        self.sumsq = np.zeros((len(self.measures),) + shape)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, **kwargs) -> 'LossCube':
+        return cls(**kwargs).update(df)
+
+    @property
+    def shape(self):
+        return self.counts.shape
+
+    def labels(self, dimension: str) -> List:
+        return list(self._encoders[dimension].keys)
+
+    def update(self, df: pd.DataFrame) -> 'LossCube':
+        """Fold new rows into the cube."""
+        codes = [self._encoders[dim].encode(self._dimension_values(df, dim)) for dim in self.dimensions]
+        new_shape = tuple(len(self._encoders[dim]) for dim in self.dimensions)
+        if new_shape != self.shape:
+            self._grow(new_shape)
+
+        flat = np.ravel_multi_index(codes, self.shape)
+        size = self.counts.size
+        self.counts += np.bincount(flat, minlength=size).reshape(self.shape)
+        for i, col in enumerate(self.measures):
+            values = np.nan_to_num(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float))
+            self.sums[i] += np.bincount(flat, weights=values, minlength=size).reshape(self.shape)
+            self.sumsq[i] += np.bincount(flat, weights=values * values, minlength=size).reshape(self.shape)
+        return self
+
+    def query(self, by: Sequence[str] = (), where: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Roll the cube up to the ``by`` dimensions, after slicing on ``where``.
+
+        ``where`` maps a dimension to one member or a list of members, e.g.
+        ``query(by=['TransactionMonth'], where={'Province': 'Gauteng'})``.
+        Returns per-group count, sum/mean/std of each measure and LossRatio.
+        """
+        by = list(by)
+        counts, sums, sumsq = self.counts, self.sums, self.sumsq
+        members_by_dim = {dim: self.labels(dim) for dim in self.dimensions}
+        for dim, members in (where or {}).items():
+            axis = self.dimensions.index(dim)
+            members = members if isinstance(members, (list, tuple, set)) else [members]
+            index = [code for code in (self._encoders[dim].get(m) for m in members) if code is not None]
+            members_by_dim[dim] = [members_by_dim[dim][i] for i in index]
+            counts = np.take(counts, index, axis=axis)
+            sums = np.take(sums, index, axis=axis + 1)
+            sumsq = np.take(sumsq, index, axis=axis + 1)
+
+        rolled = tuple(i for i, dim in enumerate(self.dimensions) if dim not in by)
+        counts = counts.sum(axis=rolled)
+        sums = sums.sum(axis=tuple(a + 1 for a in rolled))
+        sumsq = sumsq.sum(axis=tuple(a + 1 for a in rolled))
+
+        # Remaining axes follow cube order; reorder them to match ``by``
+        kept = [dim for dim in self.dimensions if dim in by]
+        order = [kept.index(dim) for dim in by]
+        counts = np.transpose(counts, order)
+        sums = np.transpose(sums, [0] + [o + 1 for o in order])
+        sumsq = np.transpose(sumsq, [0] + [o + 1 for o in order])
+
+        if by:
+            index = pd.MultiIndex.from_product([members_by_dim[dim] for dim in by], names=by)
+            if len(by) == 1:
+                index = index.get_level_values(0)
+        else:
+            index = pd.Index(['All'])
+
+        n = counts.reshape(-1).astype(float)
+        frame = pd.DataFrame({'count': counts.reshape(-1)}, index=index)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, col in enumerate(self.measures):
+                total = sums[i].reshape(-1)
+                frame[col] = total
+                frame[f'{col}_mean'] = total / n
+                frame[f'{col}_std'] = np.sqrt(np.maximum(sumsq[i].reshape(-1) - total * total / n, 0) / (n - 1))
+            if 'TotalPremium' in self.measures and 'TotalClaims' in self.measures:
+                frame['LossRatio'] = frame['TotalClaims'] / frame['TotalPremium']
+        frame = frame[frame['count'] > 0]
+        return frame.sort_index() if by else frame
+
+    def save(self, path: str):
+        """Store the cube as a compressed .npz file."""
+        np.savez_compressed(
+            path, counts=self.counts, sums=self.sums, sumsq=self.sumsq,
+            meta=np.array(json.dumps({
+                'dimensions': self.dimensions,
+                'measures': self.measures,
+                'labels': {dim: self.labels(dim) for dim in self.dimensions}
+            }))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'LossCube':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            cube = cls(meta['dimensions'], meta['measures'])
+            for dim in cube.dimensions:
+                cube._encoders[dim].encode(np.array(meta['labels'][dim], dtype=object))
+            cube.counts = data['counts']
+            cube.sums = data['sums']
+            cube.sumsq = data['sumsq']
+        return cube
+
+    def _dimension_values(self, df: pd.DataFrame, dim: str) -> np.ndarray:
+        if dim not in df.columns:
+            return np.full(len(df), MISSING_LABEL, dtype=object)
+        values = df[dim]
+        if dim == 'TransactionMonth':
+            # Month members are 'YYYY-MM' labels, whatever the day in the source;
+            # only the distinct raw values are parsed
+            codes, uniques = pd.factorize(values)
+            months = pd.to_datetime(pd.Series(uniques), errors='coerce').dt.strftime('%Y-%m')
+            months = months.astype(object).where(months.notna(), MISSING_LABEL).to_numpy()
+            return np.where(codes >= 0, months[np.maximum(codes, 0)] if len(months) else MISSING_LABEL,
+                            MISSING_LABEL)
+        return values.astype(object).where(values.notna(), MISSING_LABEL).to_numpy()
+
+    def _grow(self, new_shape):
+        pad = [(0, new - old) for new, old in zip(new_shape, self.shape)]
+        self.counts = np.pad(self.counts, pad)
+        self.sums = np.pad(self.sums, [(0, 0)] + pad)
+        self.sumsq = np.pad(self.sumsq, [(0, 0)] + pad)
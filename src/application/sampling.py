@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+DEFAULT_STRATA = ['Province', 'VehicleType', 'smoker']
+
+
+@dataclass
+class Estimate:
+    value: float
+    std_error: float
+    ci_low: float
+    ci_high: float
+    sample_size: int
+
+    @property
+    def relative_error(self) -> float:
+        """CI half-width relative to the estimate."""
+        half_width = (self.ci_high - self.ci_low) / 2
+        return abs(half_width / self.value) if self.value else float('inf')
+
+
+class StratifiedSampleStore:
+    """
+    Persisted stratified sample for fast approximate answers.
+
+    Rows are sampled without replacement within each stratum (by default the
+    Province/VehicleType/smoker columns present in the data), keeping at least
+    ``min_per_stratum`` rows per stratum. Estimates are ratio estimators
+    weighted by the stratum population sizes, with linearized standard errors
+    and finite population correction, so means, loss ratios and domain
+    (group) estimates all come with confidence intervals.
+    """
+
+    def __init__(self, sample: pd.DataFrame, population: pd.Series, strata: List[str]):
+        self.sample = sample
+        self.population = population
+        self.strata = strata
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, strata: Optional[Sequence[str]] = None, fraction: float = 0.05,
+              min_per_stratum: int = 30, seed: int = 42) -> 'StratifiedSampleStore':
+        strata = [c for c in (strata or DEFAULT_STRATA) if c in df.columns]
+        if strata:
+            codes = df.groupby(strata, dropna=False, sort=False).ngroup().to_numpy()
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+        sizes = np.bincount(codes)
+        quota = np.minimum(sizes, np.maximum(min_per_stratum, np.ceil(fraction * sizes))).astype(np.int64)
+
+        # Random order within each stratum; keep the first ``quota`` rows of each
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(len(df)), codes))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        rank = np.arange(len(df)) - starts[codes[order]]
+        chosen = np.sort(order[rank < quota[codes[order]]])
+
+        sample = df.iloc[chosen].reset_index(drop=True)
+        sample['_stratum'] = codes[chosen]
+        population = pd.Series(sizes, name='population')
+        return cls(sample, population, strata)
+
+    def save(self, path: str):
+        pd.to_pickle({'sample': self.sample, 'population': self.population, 'strata': self.strata}, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StratifiedSampleStore':
+        data = pd.read_pickle(path)
+        return cls(data['sample'], data['population'], data['strata'])
+
+    def estimate_mean(self, column: str, confidence: float = 0.95,
+                      domain: Optional[np.ndarray] = None) -> Estimate:
+        """Population mean of ``column``, optionally within a boolean ``domain`` of sample rows."""
+        domain = self._domain(domain)
+        return self._ratio(self._values(column) * domain, domain, domain, confidence)
+
+    def estimate_ratio(self, numerator: str, denominator: str, confidence: float = 0.95,
+                       domain: Optional[np.ndarray] = None) -> Estimate:
+        """Ratio of population totals, e.g. TotalClaims / TotalPremium."""
+        domain = self._domain(domain)
+        return self._ratio(self._values(numerator) * domain, self._values(denominator) * domain,
+                           domain, confidence)
+
+    def estimate_by(self, by: str, column: str, denominator: Optional[str] = None,
+                    confidence: float = 0.95) -> pd.DataFrame:
+        """Per-group mean of ``column`` (or ratio to ``denominator``) with confidence intervals."""
+        rows = {}
+        groups = self.sample[by]
+        for group in sorted(groups.dropna().unique()):
+            domain = (groups == group).to_numpy()
+            if denominator:
+                estimate = self.estimate_ratio(column, denominator, confidence, domain=domain)
+            else:
+                estimate = self.estimate_mean(column, confidence, domain=domain)
+            rows[group] = {
+                'estimate': estimate.value,
+                'std_error': estimate.std_error,
+                'ci_low': estimate.ci_low,
+                'ci_high': estimate.ci_high,
+                'relative_error': estimate.relative_error,
+                'sample_size': estimate.sample_size
+            }
+        frame = pd.DataFrame.from_dict(rows, orient='index')
+        frame.index.name = by
+        return frame
+
+    def _values(self, column: str) -> np.ndarray:
+        return np.nan_to_num(pd.to_numeric(self.sample[column], errors='coerce').to_numpy(dtype=float))
+
+    def _domain(self, domain: Optional[np.ndarray]) -> np.ndarray:
+        if domain is None:
+            return np.ones(len(self.sample))
+        return np.asarray(domain, dtype=float)
+
+    def _ratio(self, y: np.ndarray, x: np.ndarray, domain: np.ndarray, confidence: float) -> Estimate:
+        strata = self.sample['_stratum'].to_numpy()
+        n_strata = len(self.population)
+        N = self.population.to_numpy(dtype=float)
+        n = np.bincount(strata, minlength=n_strata).astype(float)
+        weights = np.divide(N, n, out=np.zeros_like(N), where=n > 0)
+
+        y_total = np.sum(weights[strata] * y)
+        x_total = np.sum(weights[strata] * x)
+        ratio = y_total / x_total if x_total else float('nan')
+
+        # Linearized variance of the ratio: stratified variance of the residuals
+        e = y - ratio * x
+        e_sum = np.bincount(strata, weights=e, minlength=n_strata)
+        e_sq = np.bincount(strata, weights=e * e, minlength=n_strata)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s2 = np.where(n > 1, (e_sq - e_sum ** 2 / n) / (n - 1), 0.0)
+            fpc = np.where(N > 0, 1 - n / N, 0.0)
+            variance = np.sum(np.where(n > 0, N ** 2 * fpc * s2 / n, 0.0)) / x_total ** 2
+
+        std_error = float(np.sqrt(max(variance, 0.0)))
+        z = stats.norm.ppf(1 - (1 - confidence) / 2)
+        return Estimate(float(ratio), std_error, float(ratio - z * std_error), float(ratio + z * std_error),
+                        int(np.count_nonzero(domain)))
+
+
+def approximate_estimates(store: Optional[StratifiedSampleStore], column: str, by: Optional[str] = None,
+                          denominator: Optional[str] = None, max_relative_error: float = 0.05,
+                          confidence: float = 0.95) -> Optional[pd.DataFrame]:
+    """
+    Answer from the sample store, or return None when it cannot meet the
+    requested precision (or lacks the columns) so the caller can scan exactly.
+    """
+    needed = [column] + [c for c in (by, denominator) if c]
+    if store is None or any(c not in store.sample.columns for c in needed):
+        return None
+    if by:
+        frame = store.estimate_by(by, column, denominator, confidence)
+    else:
+        estimate = (store.estimate_ratio(column, denominator, confidence) if denominator
+                    else store.estimate_mean(column, confidence))
+        frame = pd.DataFrame([{
+            'estimate': estimate.value,
+            'std_error': estimate.std_error,
+            'ci_low': estimate.ci_low,
+            'ci_high': estimate.ci_high,
+            'relative_error': estimate.relative_error,
+            'sample_size': estimate.sample_size
+        }], index=['All'])
+    if frame.empty or (frame['relative_error'] > max_relative_error).any():
+        return None
+    frame['method'] = 'approximate'
+    return frame
+
+
+def exact_estimates(df: pd.DataFrame, column: str, by: Optional[str] = None,
+                    denominator: Optional[str] = None) -> pd.DataFrame:
+    """Full-scan counterpart of ``approximate_estimates`` (zero-width intervals)."""
+    grouped = df.groupby(by) if by else df.groupby(np.zeros(len(df), dtype=int))
+    if denominator:
+        sums = grouped[[column, denominator]].sum()
+        value = sums[column] / sums[denominator]
+    else:
+        value = grouped[column].mean()
+    frame = pd.DataFrame({
+        'estimate': value,
+        'std_error': 0.0,
+        'ci_low': value,
+        'ci_high': value,
+        'relative_error': 0.0,
+        'sample_size': grouped.size(),
+        'method': 'exact'
+    })
+    if not by:
+        frame.index = ['All']
+    return frame
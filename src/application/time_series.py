@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence
+
+from src.application.groupby_engine import KeyEncoder
+
+METRICS = ['premium', 'claims', 'loss_ratio', 'cumulative_loss_ratio', 'premium_growth']
+
+
+class RollingSegmentSeries:
+    """
+    Monthly premium/claims series for many segments, maintained incrementally.
+
+    State is held as 2-D arrays (segments x window): a ring buffer of the last
+    ``max(windows)`` months plus running window and cumulative sums. Appending
+    a month subtracts the value leaving each window and adds the new one, so
+    the update is O(1) per segment per series no matter how long the history
+    is, and all segments are updated together with array operations.
+    """
+
+    def __init__(self, windows: Sequence[int] = (3, 12)):
+        self.windows = sorted(windows)
+        self.months: List[pd.Period] = []
+        self._encoder = KeyEncoder()
+        self._depth = max(self.windows)
+        self._ring = np.zeros((2, 0, self._depth))  # [premium, claims] x segments x slots
+        self._window_sums = {w: np.zeros((2, 0)) for w in self.windows}
+        self._cumulative = np.zeros((2, 0))
+        self._history = {metric: [] for metric in METRICS + [f'loss_ratio_{w}m' for w in self.windows]}
+
+    @property
+    def segments(self) -> List:
+        return list(self._encoder.keys)
+
+    def append_month(self, month, segments, premiums, claims):
+        """Add one month of per-segment totals; segments absent this month count as zero."""
+        month = pd.Period(month, freq='M')
+        if self.months and month <= self.months[-1]:
+            raise ValueError(f"Months must be appended in order: {month} after {self.months[-1]}")
+
+        codes = self._encoder.encode(np.asarray(segments, dtype=object))
+        self._grow(len(self._encoder))
+        n = len(self._encoder)
+        current = np.vstack([
+            np.bincount(codes, weights=np.asarray(premiums, dtype=float), minlength=n),
+            np.bincount(codes, weights=np.asarray(claims, dtype=float), minlength=n)
+        ]).astype(float)
+
+        t = len(self.months)
+        previous = self._ring[:, :, (t - 1) % self._depth].copy() if t else np.zeros_like(current)
+        for w in self.windows:
+            if t >= w:
+                self._window_sums[w] -= self._ring[:, :, (t - w) % self._depth]
+            self._window_sums[w] += current
+        self._ring[:, :, t % self._depth] = current
+        self._cumulative += current
+        self.months.append(month)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._history['premium'].append(current[0])
+            self._history['claims'].append(current[1])
+            self._history['loss_ratio'].append(current[1] / current[0])
+            self._history['cumulative_loss_ratio'].append(self._cumulative[1] / self._cumulative[0])
+            self._history['premium_growth'].append(current[0] / previous[0] - 1)
+            for w in self.windows:
+                sums = self._window_sums[w]
+                # Rolling ratios are only defined once a full window is available
+                ratio = sums[1] / sums[0] if t + 1 >= w else np.full(n, np.nan)
+                self._history[f'loss_ratio_{w}m'].append(ratio)
+
+    def append_frame(self, df: pd.DataFrame, segment_col: Optional[str] = None,
+                     month_col: str = 'TransactionMonth'):
+        """
+        Add all months in ``df`` to the series.
+
+        Rows are bucketed into a months x segments grid with one ``bincount``;
+        calendar months with no rows are appended as zeros so windows always
+        span consecutive months. Late rows for months already held are added
+        onto those months, and every value derived from them is restated.
+        """
+        months = pd.to_datetime(df[month_col], errors='coerce').dt.to_period('M')
+        valid = months.notna().to_numpy()
+        if not valid.any():
+            return self
+        month_codes, month_labels = pd.factorize(months[valid], sort=True)
+        if segment_col:
+            segment_codes, segment_labels = pd.factorize(df[segment_col].to_numpy()[valid])
+        else:
+            segment_codes, segment_labels = np.zeros(valid.sum(), dtype=np.int64), np.array(['All'], dtype=object)
+        keep = segment_codes >= 0
+        flat = month_codes[keep] * len(segment_labels) + segment_codes[keep]
+        shape = (len(month_labels), len(segment_labels))
+        premiums = self._grid(df, 'TotalPremium', valid, keep, flat, shape)
+        claims = self._grid(df, 'TotalClaims', valid, keep, flat, shape)
+
+        month_index = {m: i for i, m in enumerate(month_labels)}
+        late = [i for i, m in enumerate(month_labels) if self.months and m <= self.months[-1]]
+        if late:
+            self._restate(month_labels[late], segment_labels, premiums[late], claims[late])
+            if len(late) == len(month_labels):
+                return self
+        start = self.months[-1] + 1 if self.months else month_labels[0]
+        for month in pd.period_range(start, month_labels[-1], freq='M'):
+            i = month_index.get(month)
+            if i is None:
+                self.append_month(month, [], [], [])
+            else:
+                self.append_month(month, segment_labels, premiums[i], claims[i])
+        return self
+
+    def frame(self, metric: str = 'loss_ratio_12m') -> pd.DataFrame:
+        """A metric as a segments x months DataFrame (NaN before a segment first appears)."""
+        if metric not in self._history:
+            raise ValueError(f"Unknown metric '{metric}'. Available: {sorted(self._history)}")
+        n = len(self._encoder)
+        rows = [np.pad(column, (0, n - len(column)), constant_values=np.nan) for column in self._history[metric]]
+        matrix = np.column_stack(rows) if rows else np.zeros((n, 0))
+        return pd.DataFrame(matrix, index=pd.Index(self.segments, name='segment'),
+                            columns=pd.PeriodIndex(self.months, freq='M', name='month'))
+
+    def latest(self) -> pd.DataFrame:
+        """Every metric for the most recent month, one row per segment."""
+        n = len(self._encoder)
+        return pd.DataFrame({metric: np.pad(values[-1], (0, n - len(values[-1])), constant_values=np.nan)
+                             for metric, values in self._history.items() if values},
+                            index=pd.Index(self.segments, name='segment'))
+
+    def _restate(self, months, segments, premiums, claims):
+        """
+        Add late per-segment totals onto months already held, then rebuild the
+        rolling state and the derived history from the earliest such month on.
+        """
+        if months[0] < self.months[0]:
+            raise ValueError(f"Cannot add {months[0]}: the series starts at {self.months[0]}")
+        codes = self._encoder.encode(np.asarray(segments, dtype=object))
+        self._grow(len(self._encoder))
+        n = len(self._encoder)
+        first = len(self.months)
+        # Full months x segments history; segments that appeared later are zero before
+        values = np.stack([
+            np.vstack([np.pad(v, (0, n - len(v))) for v in self._history['premium']]),
+            np.vstack([np.pad(v, (0, n - len(v))) for v in self._history['claims']])
+        ])
+        for month, premium, claim in zip(months, premiums, claims):
+            t = self.months.index(pd.Period(month, freq='M'))
+            first = min(first, t)
+            values[0, t] += np.bincount(codes, weights=premium, minlength=n)
+            values[1, t] += np.bincount(codes, weights=claim, minlength=n)
+
+        total = len(self.months)
+        cumulative = values.cumsum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for t in range(first, total):
+                previous = values[0, t - 1] if t else np.zeros(n)
+                self._history['premium'][t] = values[0, t]
+                self._history['claims'][t] = values[1, t]
+                self._history['loss_ratio'][t] = values[1, t] / values[0, t]
+                self._history['cumulative_loss_ratio'][t] = cumulative[1, t] / cumulative[0, t]
+                self._history['premium_growth'][t] = values[0, t] / previous - 1
+                for w in self.windows:
+                    sums = cumulative[:, t] - (cumulative[:, t - w] if t >= w else 0)
+                    ratio = sums[1] / sums[0] if t + 1 >= w else np.full(n, np.nan)
+                    self._history[f'loss_ratio_{w}m'][t] = ratio
+
+        self._cumulative = cumulative[:, -1].copy()
+        for w in self.windows:
+            self._window_sums[w] = cumulative[:, -1] - (cumulative[:, -1 - w] if total > w else 0)
+        for t in range(max(0, total - self._depth), total):
+            self._ring[:, :, t % self._depth] = values[:, t]
+
+    def _grid(self, df, column, valid, keep, flat, shape) -> np.ndarray:
+        values = np.nan_to_num(pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[valid][keep])
+        return np.bincount(flat, weights=values, minlength=shape[0] * shape[1]).reshape(shape)
+
+    def _grow(self, n_segments: int):
+        grow = n_segments - self._ring.shape[1]
+        if grow <= 0:
+            return
+        self._ring = np.pad(self._ring, ((0, 0), (0, grow), (0, 0)))
+        self._cumulative = np.pad(self._cumulative, ((0, 0), (0, grow)))
+        for w in self.windows:
+            self._window_sums[w] = np.pad(self._window_sums[w], ((0, 0), (0, grow)))
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+import numpy as np
+import pandas as pd
+
+from src.domain.schema import ColumnSchema, POLICY_SCHEMA
+
+
+@dataclass
+class ValidationReport:
+    rows_checked: int = 0
+    rejected_counts: Dict[str, int] = field(default_factory=dict)
+    sample_rows: Dict[str, List[int]] = field(default_factory=dict)
+    missing_columns: List[str] = field(default_factory=list)
+
+    @property
+    def total_rejected(self) -> int:
+        return sum(self.rejected_counts.values())
+
+    def summary(self) -> pd.DataFrame:
+        """One row per column that had rejected values."""
+        return pd.DataFrame({
+            'rejected': pd.Series(self.rejected_counts, dtype='int64'),
+            'sample_rows': pd.Series(self.sample_rows, dtype=object)
+        })
+
+
+class SchemaValidator:
+    """
+    Coerces the declared columns of each chunk in one pass and accounts for
+    values that could not be converted.
+
+    Columns that the CSV parser already produced with the right dtype are
+    passed through without a copy; only columns that need conversion are
+    replaced. A value counts as rejected when it was present in the source but
+    became NaN/NaT after coercion; its 0-based data row number (across chunks)
+    is kept as a sample, up to ``max_samples`` per column.
+    """
+
+    def __init__(self, schema: List[ColumnSchema] = POLICY_SCHEMA, max_samples: int = 5):
+        self.schema = schema
+        self.max_samples = max_samples
+        self.report = ValidationReport()
+
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return a validated view of one chunk. The caller's frame is left as is:
+        the result is a shallow copy, so headers are stripped and coerced
+        columns replaced there, while untouched columns share its memory.
+        """
+        df = df.copy(deep=False)
+        df.columns = df.columns.str.strip()
+        row_offset = self.report.rows_checked
+        for column in self.schema:
+            if column.name not in df.columns:
+                if column.required and column.name not in self.report.missing_columns:
+                    self.report.missing_columns.append(column.name)
+                continue
+
+            original = df[column.name]
+            if column.dtype == 'numeric':
+                if pd.api.types.is_numeric_dtype(original) and not pd.api.types.is_bool_dtype(original):
+                    continue
+                coerced = pd.to_numeric(original, errors='coerce')
+            elif column.dtype == 'datetime':
+                if pd.api.types.is_datetime64_any_dtype(original):
+                    continue
+                coerced = pd.to_datetime(original, errors='coerce')
+            else:
+                raise ValueError(f"Unsupported dtype '{column.dtype}' for column {column.name}")
+
+            self._record_rejects(column.name, coerced.isna().to_numpy() & original.notna().to_numpy(), row_offset)
+            df[column.name] = coerced
+
+        self.report.rows_checked += len(df)
+        return df
+
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            yield self.validate(chunk)
+
+    def _record_rejects(self, name: str, rejected: np.ndarray, row_offset: int):
+        count = int(rejected.sum())
+        if count == 0:
+            return
+        self.report.rejected_counts[name] = self.report.rejected_counts.get(name, 0) + count
+        samples = self.report.sample_rows.setdefault(name, [])
+        if len(samples) < self.max_samples:
+            positions = np.flatnonzero(rejected)[:self.max_samples - len(samples)]
+            samples.extend(int(p) + row_offset for p in positions)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import List
+
+@dataclass(frozen=True)
+class ColumnSchema:
+    name: str
+    dtype: str  # 'numeric' or 'datetime'
+    required: bool = False
+
+# Typed columns of the policy/claims extract; other columns pass through untouched
+POLICY_SCHEMA: List[ColumnSchema] = [
+    ColumnSchema('TotalPremium', 'numeric', required=True),
+    ColumnSchema('TotalClaims', 'numeric', required=True),
+    ColumnSchema('TransactionMonth', 'datetime'),
+]
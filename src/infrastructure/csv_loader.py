@@ -1,5 +1,6 @@
 import pandas as pd
 from src.application.interfaces import IDataLoader
+from src.infrastructure.pipeline import prefetch
 
 class CSVLoader(IDataLoader):
     def load_data(self, file_path: str) -> pd.DataFrame:
@@ -8,3 +9,13 @@ class CSVLoader(IDataLoader):
         except Exception as e:
             print(f"Error loading CSV: {e}")
             raise
+
+    def load_chunks(self, file_path: str, chunksize: int = 100_000, max_prefetch: int = 2):
+        """Stream the CSV in chunks, parsing the next ones on a background thread."""
+        try:
+            reader = pd.read_csv(file_path, chunksize=chunksize)
+        except Exception as e:
+            print(f"Error loading CSV: {e}")
+            raise
+        with reader:
+            yield from prefetch(reader, max_prefetch)
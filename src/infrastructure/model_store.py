@@ -0,0 +1,30 @@
+import os
+import pickle
+from typing import Any, Dict, Optional, Tuple
+from src.application.interfaces import IModelStore
+
+class PickleModelStore(IModelStore):
+    """Stores each model and its metadata as ``<root>/<name>.pkl``."""
+
+    def __init__(self, root: str = 'models'):
+        self.root = root
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f'{name}.pkl')
+
+    def save(self, name: str, model: Any, metadata: Dict[str, Any]):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(name)
+        # Write to a temporary file first so a crash never leaves a half-written model behind
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'model': model, 'metadata': metadata}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, name: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return data['model'], data['metadata']
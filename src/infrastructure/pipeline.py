@@ -0,0 +1,113 @@
+import queue
+import threading
+from typing import Callable, Iterable, Iterator
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable, max_prefetch: int = 2) -> Iterator:
+    """
+    Iterate ``iterable`` on a background thread, keeping up to ``max_prefetch``
+    items ready ahead of the consumer.
+
+    The queue is bounded, so a slow consumer applies backpressure to the reader
+    instead of letting it buffer the whole input. Exceptions raised by the
+    producer are re-raised in the consumer.
+    """
+    items = queue.Queue(maxsize=max(1, max_prefetch))
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if not _put(items, item, stop):
+                    return
+        except BaseException as e:
+            _put(items, e, stop)
+            return
+        _put(items, _DONE, stop)
+
+    thread = threading.Thread(target=produce, name='prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Consumer stopped early (break/exception): release the producer
+        stop.set()
+        thread.join()
+
+
+def _put(items: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block on a full queue but give up once the consumer has gone away."""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class BackgroundWriter:
+    """
+    Single worker thread that runs submitted write tasks (PNG encoding, file
+    writes) in order, off the caller's thread.
+
+    ``submit`` blocks when ``max_pending`` tasks are already queued. The first
+    error raised by a task is re-raised from ``flush``/``close``; ``close``
+    stops the thread either way, and leaving a ``with`` block on an exception
+    does not replace it with a task error.
+    """
+
+    def __init__(self, max_pending: int = 4):
+        self._tasks = queue.Queue(maxsize=max(1, max_pending))
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='background-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable, *args, **kwargs):
+        self._tasks.put((func, args, kwargs))
+
+    def flush(self):
+        """Wait until every submitted task has finished."""
+        self._tasks.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._tasks.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except Exception:
+            if exc_type is None:
+                raise
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            try:
+                if task is None:
+                    return
+                func, args, kwargs = task
+                if self._error is None:
+                    func(*args, **kwargs)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._tasks.task_done()
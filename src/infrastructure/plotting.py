@@ -1,50 +1,100 @@
+import contextlib
+import threading
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 from src.application.interfaces import IPlotter
+from src.infrastructure.pipeline import BackgroundWriter
+
+# Matplotlib's font and text-layout caches are shared by every figure and are
+# not thread-safe, so building one figure and rendering another never overlap.
+# A background writer still overlaps rendering with the caller's non-plotting
+# work (loading, aggregation, printing).
+DRAW_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def figure(filepath, writer=None, figsize=(10, 6), **savefig_kwargs):
+    """
+    Build a pyplot figure under ``DRAW_LOCK`` and save it to ``filepath`` when
+    the block exits, on ``writer``'s thread when one is given.
+    """
+    with DRAW_LOCK:
+        fig = plt.figure(figsize=figsize)
+        try:
+            yield fig
+        finally:
+            # Detach the figure from pyplot so the writer thread owns it exclusively
+            plt.close(fig)
+    if writer is not None:
+        writer.submit(_savefig, fig, filepath, **savefig_kwargs)
+    else:
+        _savefig(fig, filepath, **savefig_kwargs)
+
+
+def _savefig(fig, filepath, **kwargs):
+    with DRAW_LOCK:
+        fig.savefig(filepath, **kwargs)
+
 
 class MatplotlibPlotter(IPlotter):
+    def __init__(self, output_dir='reports/figures', async_writes=False):
+        self.output_dir = output_dir
+        # With async_writes, PNG rendering/encoding runs on a writer thread
+        # while the caller moves on with its analysis; call close() (or use
+        # the plotter as a context manager) to stop the thread
+        self._writer = BackgroundWriter() if async_writes else None
+
     def plot_distribution(self, data, column):
-        plt.figure(figsize=(10, 6))
-        sns.histplot(data[column].dropna(), kde=True)
-        plt.title(f"Distribution of {column}")
-        plt.xlabel(column)
-        plt.ylabel("Frequency")
-        os.makedirs('reports/figures', exist_ok=True)
-        plt.savefig(f'reports/figures/dist_{column}.png')
-        plt.close()
+        with self._figure(f'dist_{column}.png'):
+            sns.histplot(data[column].dropna(), kde=True)
+            plt.title(f"Distribution of {column}")
+            plt.xlabel(column)
+            plt.ylabel("Frequency")
 
     def plot_scatter(self, data, x_col, y_col):
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(data=data, x=x_col, y=y_col)
-        plt.title(f"{x_col} vs {y_col}")
-        os.makedirs('reports/figures', exist_ok=True)
-        plt.savefig(f'reports/figures/scatter_{x_col}_{y_col}.png')
-        plt.close()
+        with self._figure(f'scatter_{x_col}_{y_col}.png'):
+            sns.scatterplot(data=data, x=x_col, y=y_col)
+            plt.title(f"{x_col} vs {y_col}")
 
     def plot_boxplot(self, data, column):
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x=data[column].dropna())
-        plt.title(f"Boxplot of {column}")
-        os.makedirs('reports/figures', exist_ok=True)
-        plt.savefig(f'reports/figures/box_{column}.png')
-        plt.close()
+        with self._figure(f'box_{column}.png'):
+            sns.boxplot(x=data[column].dropna())
+            plt.title(f"Boxplot of {column}")
 
     def plot_bar(self, data, x_col, y_col, title):
-        plt.figure(figsize=(12, 6))
-        sns.barplot(data=data, x=x_col, y=y_col)
-        plt.title(title)
-        plt.xticks(rotation=45)
-        os.makedirs('reports/figures', exist_ok=True)
-        plt.savefig(f'reports/figures/bar_{title.replace(" ", "_")}.png')
-        plt.close()
+        with self._figure(f'bar_{title.replace(" ", "_")}.png', figsize=(12, 6)):
+            sns.barplot(data=data, x=x_col, y=y_col)
+            plt.title(title)
+            plt.xticks(rotation=45)
 
     def plot_time_series(self, data, date_col, value_cols):
-        plt.figure(figsize=(14, 7))
-        for col in value_cols:
-            plt.plot(data[date_col], data[col], label=col)
-        plt.title("Time Series Analysis")
-        plt.legend()
-        os.makedirs('reports/figures', exist_ok=True)
-        plt.savefig('reports/figures/time_series.png')
-        plt.close()
+        with self._figure('time_series.png', figsize=(14, 7)):
+            for col in value_cols:
+                plt.plot(data[date_col], data[col], label=col)
+            plt.title("Time Series Analysis")
+            plt.legend()
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except Exception:
+            # A failed figure write must not hide the error leaving the with block
+            if exc_type is None:
+                raise
+
+    def _figure(self, filename, figsize=(10, 6)):
+        os.makedirs(self.output_dir, exist_ok=True)
+        return figure(os.path.join(self.output_dir, filename), self._writer, figsize=figsize)
@@ -0,0 +1,25 @@
+import multiprocessing
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module; memory limits are skipped
+    resource = None
+
+
+def limit_memory(memory_limit_mb: Optional[int]):
+    """Cap the address space of the current worker process."""
+    if memory_limit_mb and resource is not None:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def thread_safe_context():
+    """
+    Multiprocessing context for pools created while other threads are running
+    (e.g. a prefetching reader). Forking then copies locks held by those
+    threads into the child, which can deadlock it; forkserver (or spawn where
+    it is unavailable) starts workers from a clean single-threaded process.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
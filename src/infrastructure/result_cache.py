@@ -0,0 +1,115 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+from src.application.interfaces import IResultCache
+
+class ResultCache(IResultCache):
+    """
+    Two-level cache for service results.
+
+    Recent entries are kept pickled in an in-process LRU of at most
+    ``max_memory_mb``; every entry is also written to ``cache_dir`` so other
+    processes (notebooks, the CLI) and later sessions can reuse it. The disk
+    store is trimmed to ``max_disk_mb`` by removing the least recently used
+    files. Values are stored pickled and unpickled on every hit, so a caller
+    mutating a returned result cannot change what is cached.
+    """
+
+    def __init__(self, cache_dir: str = '.cache/results', max_memory_mb: float = 64,
+                 max_disk_mb: float = 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            else:
+                data = self._read(key)
+                if data is not None:
+                    self._remember(key, data)
+            if data is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return pickle.loads(data)
+
+    def set(self, key: str, value: Any):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, data)
+            if len(data) <= self.max_disk_bytes:
+                self._write(key, data)
+                self._trim_disk()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for name in self._entries():
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [name for name in os.listdir(self.cache_dir) if name.endswith('.pkl')]
+
+    def _remember(self, key: str, data: bytes):
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # Touch the file so disk eviction sees it as recently used
+        os.utime(path)
+        return data
+
+    def _write(self, key: str, data: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _trim_disk(self):
+        entries = []
+        for name in self._entries():
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
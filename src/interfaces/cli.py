@@ -1,26 +1,206 @@
+"""
+Insurance Risk Analytics command line.
+
+Commands are registered in ``COMMANDS``; each one imports the services it
+needs only when it runs, so ``--help`` and light commands start without
+loading pandas, scipy or matplotlib.
+
+Usage:
+    python src/interfaces/cli.py eda --file data/insurance_claims.csv
+    python src/interfaces/cli.py abtest --file data/insurance.csv
+    python src/interfaces/cli.py integrate --pipelined
+    python src/interfaces/cli.py model train --file data/insurance.csv
+"""
 import argparse
+import glob
 import sys
 import os
 
-# Add project root to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+
+def collect_files(patterns=None, manifest=None):
+    """Expand glob patterns and manifest entries into a de-duplicated file list."""
+    files = []
+    for pattern in patterns or []:
+        files.extend(sorted(glob.glob(pattern)))
+    if manifest:
+        # One path per line; blank lines and '#' comments are ignored and
+        # relative paths are resolved against the manifest's directory
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest) as f:
+            for line in f:
+                entry = line.strip()
+                if entry and not entry.startswith('#'):
+                    files.append(entry if os.path.isabs(entry) else os.path.join(base_dir, entry))
+    return list(dict.fromkeys(files))
 
-from src.infrastructure.csv_loader import CSVLoader
-from src.infrastructure.plotting import MatplotlibPlotter
-from src.application.eda_service import EDAService
+def _add_cache_argument(parser):
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Reuse results computed earlier on unchanged data from this directory")
 
-def main():
-    parser = argparse.ArgumentParser(description="Insurance Risk Analytics EDA")
+def _result_cache(args):
+    if not args.cache_dir:
+        return None
+    from src.infrastructure.result_cache import ResultCache
+    return ResultCache(args.cache_dir)
+
+def _add_eda_arguments(parser):
     parser.add_argument("--file", type=str, help="Path to the dataset CSV file")
-    args = parser.parse_args()
+    parser.add_argument("--glob", type=str, action="append", dest="patterns",
+                        help="Glob of dataset CSV files to analyze in batch (repeatable)")
+    parser.add_argument("--manifest", type=str, help="Text file listing one dataset path per line")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch runs")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="Memory limit per batch job")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Stream the file in chunks and write figures on a background thread")
+    parser.add_argument("--output-dir", type=str, default="reports/batch",
+                        help="Directory for per-dataset figures in batch runs")
+
+def run_eda(args):
+    from src.infrastructure.csv_loader import CSVLoader
+    from src.infrastructure.plotting import MatplotlibPlotter
+
+    if args.patterns or args.manifest:
+        from src.application.batch_eda_service import BatchEDAService
 
+        files = collect_files(args.patterns, args.manifest)
+        if not files:
+            print("No files matched the given --glob/--manifest")
+            return 1
+        print(f"Running EDA over {len(files)} file(s)...")
+        service = BatchEDAService(CSVLoader, MatplotlibPlotter, max_workers=args.workers,
+                                  memory_limit_mb=args.max_memory_mb, output_dir=args.output_dir)
+        summary = service.run(files)
+        print(summary.to_string(index=False))
+        return 1 if (summary['status'] != 'ok').any() else 0
     if args.file:
-        loader = CSVLoader()
-        plotter = MatplotlibPlotter()
-        service = EDAService(loader, plotter)
-        service.perform_initial_analysis(args.file)
+        from src.application.eda_service import EDAService
+
+        with MatplotlibPlotter(async_writes=args.pipelined) as plotter:
+            service = EDAService(CSVLoader(), plotter)
+            service.perform_initial_analysis(args.file, pipelined=args.pipelined)
+        return 0
+    print("Please provide a file path using --file, or --glob/--manifest for a batch run")
+    return 1
+
+def _add_abtest_arguments(parser):
+    parser.add_argument("--file", type=str, required=True, help="Path to the dataset CSV file")
+    parser.add_argument("--claim-frequency", action="store_true",
+                        help="Run claim vs no-claim chi-squared tests on a policy extract instead")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    _add_cache_argument(parser)
+
+def run_abtest(args):
+    from src.application.ab_testing_service import ABTestingService
+    from src.infrastructure.csv_loader import CSVLoader
+
+    service = ABTestingService(CSVLoader(), result_cache=_result_cache(args))
+    service.alpha = args.alpha
+    if args.claim_frequency:
+        results = service.run_claim_frequency_tests(args.file)
     else:
-        print("Please provide a file path using --file")
+        results = service.run_all_tests(args.file)
+    for name, result in results.items():
+        print(f"\n[{name}] {result['hypothesis']} ({result['test']})")
+        print(f"   {result['interpretation']}")
+    return 0
+
+def _add_integrate_arguments(parser):
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Prefetch the second file and write figures on a background thread")
+    parser.add_argument("--dedup-keys", nargs="+", default=None,
+                        help="Columns identifying the same policy record in both files")
+    parser.add_argument("--keep", choices=['latest', 'first', 'last'], default="last",
+                        help="Which duplicate survives: last or first occurrence, or latest TransactionMonth "
+                             "(only with --dedup-keys that leave out TransactionMonth)")
+
+def run_integrate(args):
+    # The integration script lives at the project root
+    if PROJECT_ROOT not in sys.path:
+        sys.path.append(PROJECT_ROOT)
+    import integrate_data
+
+    keys = args.dedup_keys or integrate_data.DEFAULT_KEYS
+    integrate_data.main(pipelined=args.pipelined, keys=keys, keep=args.keep)
+    return 0
+
+def _add_model_arguments(parser):
+    actions = parser.add_subparsers(dest="action", required=True)
+    for action, help_text in [("train", "Fit a model from scratch on the full history"),
+                              ("update", "Warm-start the stored model on newly arrived rows"),
+                              ("rerate", "Score a whole extract into risk-tier partitions")]:
+        sub = actions.add_parser(action, help=help_text)
+        sub.add_argument("--file", type=str, required=True, help="Path to the dataset CSV file")
+        sub.add_argument("--model-type", choices=['random_forest', 'xgboost', 'sgd'], default="random_forest")
+        sub.add_argument("--model-dir", type=str, default="models", help="Where trained models are stored")
+        if action == "update":
+            sub.add_argument("--extra-estimators", type=int, default=20,
+                             help="Trees or boosting rounds added by the update")
+        if action == "rerate":
+            sub.add_argument("--workers", type=int, default=None, help="Worker processes")
+            sub.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk")
+            sub.add_argument("--output-dir", type=str, default="reports/predictions",
+                             help="Directory for the partitioned predictions")
+
+def run_model(args):
+    from src.infrastructure.csv_loader import CSVLoader
+    from src.infrastructure.model_store import PickleModelStore
+
+    store = PickleModelStore(args.model_dir)
+    if args.action == "rerate":
+        from src.application.batch_prediction_service import BatchPredictionService
+
+        service = BatchPredictionService(CSVLoader(), store, model_type=args.model_type,
+                                         max_workers=args.workers, output_dir=args.output_dir)
+        summary = service.run(args.file, chunksize=args.chunksize)
+        print(f"Re-rated {summary['rows']:,} rows in {summary['seconds']:.1f}s "
+              f"({summary['rows_per_second']:,.0f} rows/sec) -> {summary['output_dir']}")
+        print(f"   Tiers: {summary['tier_counts']}")
+        return 0
+
+    from src.application.modeling_service import ModelingService
+
+    service = ModelingService(store, CSVLoader())
+    if args.action == "train":
+        report = service.train(CSVLoader().load_data(args.file), args.model_type)
+    else:
+        report = service.update_from_file(args.file, args.model_type, args.extra_estimators)
+    status = "promoted" if report['promoted'] else "NOT promoted (holdout drift)"
+    print(f"{args.model_type}: {status}, holdout RMSE {report['holdout_rmse']:,.2f}, "
+          f"{report['seconds']:.1f}s")
+    return 0
+
+# name -> (help, argument setup, handler)
+COMMANDS = {
+    "eda": ("Exploratory analysis of one or many policy extracts", _add_eda_arguments, run_eda),
+    "abtest": ("Hypothesis tests on charges or claim frequency", _add_abtest_arguments, run_abtest),
+    "integrate": ("Integrate and reconcile the insurance datasets", _add_integrate_arguments, run_integrate),
+    "model": ("Train, update and apply the charges models", _add_model_arguments, run_model),
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Insurance Risk Analytics")
+    commands = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+    for name, (help_text, add_arguments, handler) in COMMANDS.items():
+        sub = commands.add_parser(name, help=help_text, description=help_text)
+        add_arguments(sub)
+        sub.set_defaults(handler=handler)
+    return parser
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Invocations from before subcommands existed (e.g. ``--file x.csv``) run EDA
+    if argv and argv[0].startswith('-') and argv[0] not in ('-h', '--help'):
+        argv.insert(0, "eda")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    return args.handler(args)
 
 if __name__ == "__main__":
-    main()
+    # Running the file directly does not put the project root on the path
+    if PROJECT_ROOT not in sys.path:
+        sys.path.append(PROJECT_ROOT)
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from tests.helpers import NullPlotter
+
+
+@pytest.fixture
+def null_plotter():
+    """Plotter that draws nothing, for tests of the analysis itself."""
+    return NullPlotter()
@@ -0,0 +1,27 @@
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+# Add project root to path
+sys.path.append(PROJECT_ROOT)
+
+from src.application.interfaces import IPlotter
+
+# Packages the CLI must not load until a command that needs them runs
+HEAVY_MODULES = ['pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn', 'sklearn', 'xgboost']
+
+
+class NullPlotter(IPlotter):
+    """Plotter that draws nothing, for tests and timings of the analysis itself."""
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir
+    def plot_distribution(self, data, column):
+        pass
+    def plot_scatter(self, data, x_col, y_col):
+        pass
+    def plot_boxplot(self, data, column):
+        pass
+    def plot_bar(self, data, x_col, y_col, title):
+        pass
+    def plot_time_series(self, data, date_col, value_cols):
+        pass
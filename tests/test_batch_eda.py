@@ -0,0 +1,90 @@
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.batch_eda_service import BatchEDAService
+from src.infrastructure.csv_loader import CSVLoader
+from src.interfaces.cli import collect_files
+from tests.helpers import NullPlotter
+
+
+class CrashingLoader(CSVLoader):
+    """Kills its worker process outright on files named ``crash*``, like the OOM killer would."""
+    def load_data(self, file_path):
+        if os.path.basename(file_path).startswith('crash'):
+            os._exit(1)
+        return super().load_data(file_path)
+
+
+def _write_extract(path, premiums, claims):
+    pd.DataFrame({
+        'TransactionMonth': ['2014-01-01'] * len(premiums),
+        'TotalPremium': premiums,
+        'TotalClaims': claims,
+        'Province': ['Gauteng'] * len(premiums),
+        'Gender': ['Male'] * len(premiums)
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_batch_run_in_process(tmp_path):
+    files = [_write_extract(tmp_path / 'a.csv', [100, 100], [50, 0]),
+             _write_extract(tmp_path / 'b.csv', [200], [300])]
+    service = BatchEDAService(CSVLoader, NullPlotter, max_workers=1, output_dir=str(tmp_path / 'out'))
+
+    summary = service.run(files)
+
+    assert list(summary['file']) == files
+    assert (summary['status'] == 'ok').all()
+    assert list(summary['rows']) == [2, 1]
+    assert summary['loss_ratio'].tolist() == pytest.approx([0.25, 1.5])
+    assert os.path.exists(tmp_path / 'out' / 'a' / 'analysis.log')
+
+
+def test_batch_run_reports_failures(tmp_path):
+    files = [_write_extract(tmp_path / 'a.csv', [100], [10]), str(tmp_path / 'missing.csv')]
+    service = BatchEDAService(CSVLoader, NullPlotter, max_workers=1, output_dir=str(tmp_path / 'out'))
+
+    summary = service.run(files)
+
+    assert list(summary['status']) == ['ok', 'failed']
+    assert 'FileNotFoundError' in summary['error'].iloc[1]
+
+
+def test_batch_run_on_process_pool(tmp_path):
+    files = [_write_extract(tmp_path / f'extract_{i}.csv', [100 * (i + 1)], [10]) for i in range(3)]
+    service = BatchEDAService(CSVLoader, NullPlotter, max_workers=2, output_dir=str(tmp_path / 'out'))
+
+    summary = service.run(files)
+
+    assert list(summary['file']) == files
+    assert (summary['status'] == 'ok').all()
+    assert summary['total_premium'].tolist() == [100, 200, 300]
+
+
+def test_batch_run_survives_a_dead_worker(tmp_path):
+    files = [_write_extract(tmp_path / f'extract_{i}.csv', [100], [10]) for i in range(2)]
+    files.insert(1, _write_extract(tmp_path / 'crash.csv', [100], [10]))
+    files.append(_write_extract(tmp_path / 'extract_late.csv', [100], [10]))
+    service = BatchEDAService(CrashingLoader, NullPlotter, max_workers=2, output_dir=str(tmp_path / 'out'))
+
+    summary = service.run(files)
+
+    assert list(summary['file']) == files
+    assert list(summary['status']) == ['ok', 'failed', 'ok', 'ok']
+    assert 'BrokenProcessPool' in summary['error'].iloc[1]
+
+
+def test_collect_files_from_glob_and_manifest(tmp_path):
+    a = _write_extract(tmp_path / 'a.csv', [1], [0])
+    b = _write_extract(tmp_path / 'b.csv', [1], [0])
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text("# monthly extracts\nb.csv\n\n")
+
+    files = collect_files([str(tmp_path / '*.csv')], str(manifest))
+
+    assert files == [a, b]
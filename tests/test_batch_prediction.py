@@ -0,0 +1,98 @@
+import pytest
+import glob
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.batch_prediction_service import BatchPredictionService
+from src.application.modeling_service import ModelingService
+from src.infrastructure.csv_loader import CSVLoader
+from src.infrastructure.model_store import PickleModelStore
+from benchmarks.data_generator import generate_insurance_data
+
+
+@pytest.fixture
+def trained_store(tmp_path):
+    store = PickleModelStore(str(tmp_path / 'models'))
+    ModelingService(store).train(generate_insurance_data(1000, seed=1), 'random_forest', n_estimators=10)
+    return store
+
+
+@pytest.fixture
+def extract(tmp_path):
+    path = tmp_path / 'book.csv'
+    generate_insurance_data(2500, seed=2).drop(columns='charges').rename_axis('row').to_csv(path)
+    return str(path)
+
+
+def _read_output(output_dir):
+    parts = [pd.read_csv(path) for path in glob.glob(os.path.join(output_dir, 'RiskTier=*', 'part-*.csv'))]
+    return pd.concat(parts, ignore_index=True)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_rerates_every_row(tmp_path, trained_store, extract, max_workers):
+    output_dir = str(tmp_path / 'predictions')
+    service = BatchPredictionService(CSVLoader(), trained_store, max_workers=max_workers,
+                                     max_in_flight=2, output_dir=output_dir)
+    summary = service.run(extract, chunksize=400)
+
+    assert summary['rows'] == 2500
+    assert summary['chunks'] == 7
+    assert summary['rows_per_second'] > 0
+    assert sum(summary['tier_counts'].values()) == 2500
+
+    scored = _read_output(output_dir)
+    assert len(scored) == 2500
+    assert set(scored['RiskTier']) <= {'Low', 'Medium', 'High'}
+
+    # Partitions agree with scoring the whole file in memory
+    model, metadata = trained_store.load('random_forest')
+    expected = ModelingService(trained_store).predict(pd.read_csv(extract))
+    book = pd.read_csv(extract).assign(PredictedPremium=expected)
+    merged = scored.sort_values('row').reset_index(drop=True)
+    np.testing.assert_allclose(merged['PredictedPremium'], book['PredictedPremium'])
+    high = merged['RiskTier'] == 'High'
+    assert (merged.loc[high, 'PredictedPremium'] >= metadata['tier_bounds'][1]).all()
+
+
+def test_rerun_replaces_previous_partitions(tmp_path, trained_store, extract):
+    output_dir = str(tmp_path / 'predictions')
+    service = BatchPredictionService(CSVLoader(), trained_store, max_workers=1, output_dir=output_dir)
+    service.run(extract, chunksize=400)
+    service.run(extract, chunksize=1000)
+
+    assert len(_read_output(output_dir)) == 2500
+    assert not glob.glob(os.path.join(output_dir, 'RiskTier=*', 'part-00003.csv'))
+
+
+def test_custom_tier_bounds(tmp_path, trained_store, extract):
+    service = BatchPredictionService(CSVLoader(), trained_store, max_workers=1,
+                                     output_dir=str(tmp_path / 'predictions'))
+    summary = service.run(extract, tier_bounds=[0, 0])
+    assert summary['tier_counts'] == {'Low': 0, 'Medium': 0, 'High': 2500}
+
+    with pytest.raises(ValueError):
+        service.run(extract, tier_bounds=[1000])
+
+
+def test_missing_model(tmp_path, extract):
+    service = BatchPredictionService(CSVLoader(), PickleModelStore(str(tmp_path / 'empty')), max_workers=1)
+    with pytest.raises(ValueError):
+        service.run(extract)
+
+
+def test_model_without_tier_bounds_asks_for_retrain(tmp_path, trained_store, extract):
+    model, metadata = trained_store.load('random_forest')
+    del metadata['tier_bounds']
+    trained_store.save('random_forest', model, metadata)
+    service = BatchPredictionService(CSVLoader(), trained_store, max_workers=1,
+                                     output_dir=str(tmp_path / 'predictions'))
+
+    with pytest.raises(ValueError, match='retrain'):
+        service.run(extract)
+    assert service.run(extract, tier_bounds=[0, 0])['rows'] == 2500
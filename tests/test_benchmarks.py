@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from benchmarks.data_generator import (
+    generate_insurance_data, generate_policy_claims_data, write_dataset
+)
+from benchmarks.run_benchmarks import compare_results, parse_size
+
+
+def test_generators_are_reproducible():
+    assert generate_insurance_data(500, seed=7).equals(generate_insurance_data(500, seed=7))
+    assert generate_policy_claims_data(500, seed=7).equals(generate_policy_claims_data(500, seed=7))
+
+
+def test_policy_claims_shape():
+    df = generate_policy_claims_data(20000, seed=1, n_postal_codes=3000, n_makes=300)
+
+    assert len(df) == 20000
+    # Claims are zero-inflated and the key columns are high-cardinality
+    assert (df['TotalClaims'] == 0).mean() > 0.9
+    assert df['PostalCode'].nunique() > 500
+    assert df['make'].nunique() > 100
+
+
+def test_write_dataset_in_chunks(tmp_path):
+    path = write_dataset('policy_claims', 2500, str(tmp_path / 'claims.csv'), seed=3, chunk_rows=1000)
+    df = pd.read_csv(path)
+
+    assert len(df) == 2500
+    assert df['UnderwrittenCoverID'].is_unique
+
+
+def test_parse_size():
+    assert parse_size('10k') == 10_000
+    assert parse_size('1m') == 1_000_000
+    assert parse_size('2500') == 2500
+
+
+def test_compare_results_flags_regressions():
+    baseline = [{'benchmark': 'load', 'rows': 1000, 'seconds': 1.0},
+                {'benchmark': 'eda', 'rows': 1000, 'seconds': 2.0}]
+    current = [{'benchmark': 'load', 'rows': 1000, 'seconds': 1.1},
+               {'benchmark': 'eda', 'rows': 1000, 'seconds': 3.0}]
+
+    regressions = compare_results(current, baseline, tolerance=0.25)
+
+    assert [r['benchmark'] for r in regressions] == ['eda']
+    assert regressions[0]['ratio'] == pytest.approx(1.5)
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.interfaces import cli
+from benchmarks.data_generator import generate_insurance_data
+from tests.helpers import HEAVY_MODULES, PROJECT_ROOT
+
+
+def test_import_does_not_load_heavy_packages():
+    probe = f"import sys, src.interfaces.cli; print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.split() == []
+
+
+def test_services_import_feature_modules_on_use():
+    features = ['sampling', 'credibility', 'olap_cube', 'time_series', 'groupby_engine', 'contingency']
+    probe = ("import sys, src.application.eda_service, src.application.ab_testing_service; "
+             f"print(*[m for m in {features!r} if 'src.application.' + m in sys.modules])")
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.split() == []
+
+
+def test_help_runs_as_script():
+    result = subprocess.run([sys.executable, os.path.join('src', 'interfaces', 'cli.py'), '--help'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0
+    for command in cli.COMMANDS:
+        assert command in result.stdout
+
+
+def test_legacy_flags_run_eda(monkeypatch):
+    calls = []
+    help_text, add_arguments, _ = cli.COMMANDS['eda']
+    monkeypatch.setitem(cli.COMMANDS, 'eda', (help_text, add_arguments, lambda args: calls.append(args) or 0))
+
+    assert cli.main(['--file', 'data.csv', '--pipelined']) == 0
+    assert calls[0].command == 'eda'
+    assert calls[0].file == 'data.csv'
+    assert calls[0].pipelined
+
+
+def test_no_command_prints_help(capsys):
+    assert cli.main([]) == 1
+    assert 'usage' in capsys.readouterr().out
+
+
+def test_model_train_and_rerate(tmp_path, capsys):
+    history = tmp_path / 'history.csv'
+    book = tmp_path / 'book.csv'
+    generate_insurance_data(600, seed=1).to_csv(history, index=False)
+    generate_insurance_data(300, seed=2).drop(columns='charges').to_csv(book, index=False)
+    model_dir = str(tmp_path / 'models')
+
+    assert cli.main(['model', 'train', '--file', str(history), '--model-type', 'sgd',
+                     '--model-dir', model_dir]) == 0
+    assert cli.main(['model', 'rerate', '--file', str(book), '--model-type', 'sgd', '--model-dir', model_dir,
+                     '--workers', '1', '--output-dir', str(tmp_path / 'predictions')]) == 0
+
+    output = capsys.readouterr().out
+    assert 'sgd: promoted' in output
+    assert 'Re-rated 300 rows' in output
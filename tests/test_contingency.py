@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import stats
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.ab_testing_service import ABTestingService
+from src.application.contingency import SparseContingencyTable, claim_frequency_tables
+from src.application.interfaces import IDataLoader
+from benchmarks.data_generator import generate_policy_claims_data
+
+
+class PolicyLoader(IDataLoader):
+    """Serves a synthetic policy book regardless of path."""
+    def __init__(self, df):
+        self.df = df
+
+    def load_data(self, file_path: str) -> pd.DataFrame:
+        return self.df.copy()
+
+
+def _frame(seed=0, n=5000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Province': rng.choice(['Gauteng', 'Limpopo', 'Western Cape'], n),
+        'Gender': rng.choice(['Male', 'Female', None], n),
+        'TotalClaims': np.where(rng.random(n) < 0.1, rng.uniform(100, 1000, n), 0.0)
+    })
+
+
+class TestSparseContingencyTable:
+
+    def test_matches_scipy_on_dense_table(self):
+        df = _frame()
+        table = claim_frequency_tables([df], ['Province'])['Province']
+        observed = pd.crosstab(df['Province'], df['TotalClaims'] > 0).to_numpy()
+        chi2, p_value, dof, _ = stats.chi2_contingency(observed, correction=False)
+        g, g_p_value, _, _ = stats.chi2_contingency(observed, correction=False, lambda_='log-likelihood')
+
+        result = table.statistics()
+        assert result['chi2_statistic'] == pytest.approx(chi2)
+        assert result['p_value'] == pytest.approx(p_value)
+        assert result['g_statistic'] == pytest.approx(g)
+        assert result['g_p_value'] == pytest.approx(g_p_value)
+        assert result['dof'] == dof
+        assert result['n'] == len(df)
+
+    def test_chunked_updates_match_single_pass(self):
+        df = _frame(seed=1)
+        whole = claim_frequency_tables([df], ['Province'])['Province']
+        chunked = claim_frequency_tables([df.iloc[i:i + 700] for i in range(0, len(df), 700)],
+                                         ['Province'])['Province']
+        assert chunked.statistics() == pytest.approx(whole.statistics())
+        assert chunked.table.nnz <= 6
+
+    def test_long_streams_are_compacted(self):
+        df = _frame()
+        single = SparseContingencyTable().update(df['Province'], df['TotalClaims'] > 0)
+        streamed = SparseContingencyTable(max_parts=4)
+        for start in range(0, len(df), 100):
+            part = df.iloc[start:start + 100]
+            streamed.update(part['Province'], part['TotalClaims'] > 0)
+            assert len(streamed._parts) <= 5
+
+        assert (streamed.table != single.table).nnz == 0
+
+    def test_missing_values_are_excluded(self):
+        df = _frame(seed=2)
+        table = claim_frequency_tables([df], ['Gender'])['Gender']
+        assert table.statistics()['n'] == df['Gender'].notna().sum()
+        assert set(table.to_frame().index) == {'Male', 'Female'}
+
+    def test_single_level_has_no_test(self):
+        table = SparseContingencyTable().update(['A'] * 10, [True, False] * 5)
+        result = table.statistics()
+        assert result['dof'] == 0
+        assert np.isnan(result['p_value'])
+
+    def test_high_cardinality_stays_sparse(self):
+        df = generate_policy_claims_data(20_000, seed=3, n_postal_codes=5000)
+        table = claim_frequency_tables([df], ['PostalCode'])['PostalCode']
+        assert table.table.shape[0] == df['PostalCode'].nunique()
+        assert table.table.nnz < 2 * table.table.shape[0]
+        assert np.isfinite(table.statistics()['chi2_statistic'])
+
+
+class TestClaimFrequencyTests:
+
+    def setup_method(self):
+        self.df = generate_policy_claims_data(5000, seed=4)
+        self.service = ABTestingService(PolicyLoader(self.df))
+
+    def test_run_claim_frequency_tests(self):
+        results = self.service.run_claim_frequency_tests('dummy.csv', chunksize=1000)
+
+        assert set(results) == {'Province', 'Gender', 'PostalCode', 'make'}
+        for dimension, result in results.items():
+            assert dimension in result['hypothesis']
+            assert result['test'] == 'Chi-squared test of independence'
+            assert 0 <= result['p_value'] <= 1
+            assert isinstance(result['reject_null'], bool)
+            assert dimension in result['interpretation']
+            assert result['n'] == len(self.df)
+
+    def test_detects_frequency_difference(self):
+        df = _frame(seed=5)
+        df.loc[df['Province'] == 'Gauteng', 'TotalClaims'] = 500.0
+        result = self.service.test_claim_frequency(df, 'Province')
+        assert result['reject_null']
+        assert 'REJECT' in result['interpretation']
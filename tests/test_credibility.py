@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.credibility import CredibilityEngine, buhlmann_straub, segment_moments
+
+
+def _book(seed=0):
+    """Three provinces; each postal code has its own true loss ratio."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for province, n_codes in [('Gauteng', 30), ('Limpopo', 10), ('Free State', 5)]:
+        for code in range(n_codes):
+            true_lr = rng.gamma(4, 0.15)
+            size = 2000 if code == 0 else rng.integers(1, 40)
+            for month in range(12):
+                premium = rng.uniform(50, 150, size)
+                rows.append(pd.DataFrame({
+                    'Province': province,
+                    'PostalCode': f'{province[:2]}{code}',
+                    'TransactionMonth': f'2014-{month + 1:02d}-01',
+                    'TotalPremium': premium,
+                    'TotalClaims': premium * true_lr * rng.gamma(2, 0.5, size)
+                }))
+    return pd.concat(rows, ignore_index=True)
+
+
+def _textbook(df, key):
+    """Loop-based Bühlmann-Straub with a single collective."""
+    cells = df.assign(m=df['TransactionMonth']).groupby([key, 'm'])[['TotalPremium', 'TotalClaims']].sum()
+    cells['X'] = cells['TotalClaims'] / cells['TotalPremium']
+    segments = {}
+    for name, group in cells.groupby(level=0):
+        w = group['TotalPremium'].to_numpy()
+        x = group['X'].to_numpy()
+        segments[name] = (w, x)
+    w_i = {k: w.sum() for k, (w, x) in segments.items()}
+    xbar_i = {k: (w * x).sum() / w.sum() for k, (w, x) in segments.items()}
+    s2 = sum(((w * (x - xbar_i[k]) ** 2).sum()) for k, (w, x) in segments.items()) / \
+        sum(len(w) - 1 for w, x in segments.values())
+    total = sum(w_i.values())
+    xbar = sum(w_i[k] * xbar_i[k] for k in segments) / total
+    a = (sum(w_i[k] * (xbar_i[k] - xbar) ** 2 for k in segments) - (len(segments) - 1) * s2) / \
+        (total - sum(v ** 2 for v in w_i.values()) / total)
+    return s2, max(a, 0), {k: w_i[k] / (w_i[k] + s2 / a) for k in segments}
+
+
+def test_matches_textbook_estimator():
+    df = _book()
+    df = df[df['Province'] == 'Gauteng']
+    moments = segment_moments(df, ['PostalCode'])
+
+    s2, a, z = buhlmann_straub(moments['weight'].to_numpy(), moments['claims'].to_numpy(),
+                               moments['weighted_sq'].to_numpy(), moments['periods'].to_numpy(dtype=float),
+                               np.zeros(len(moments), dtype=np.int64), 1)
+    expected_s2, expected_a, expected_z = _textbook(df, 'PostalCode')
+
+    assert s2[0] == pytest.approx(expected_s2)
+    assert a[0] == pytest.approx(expected_a)
+    assert z == pytest.approx([expected_z[k] for k in moments.index])
+
+
+def test_large_segments_keep_their_experience():
+    tables = CredibilityEngine(hierarchies=[('Province', 'PostalCode')]).fit(_book())
+    postal = tables['PostalCode']
+
+    large = postal.xs('Ga0', level='PostalCode')['credibility'].iloc[0]
+    small = postal.drop('Ga0', level='PostalCode')['credibility'].median()
+    assert large > 0.9
+    assert small < large
+    assert ((postal['credibility'] >= 0) & (postal['credibility'] <= 1)).all()
+
+
+def test_estimate_lies_between_experience_and_complement():
+    tables = CredibilityEngine(hierarchies=[('Province', 'PostalCode')]).fit(_book())
+
+    for table in tables.values():
+        low = np.minimum(table['observed_loss_ratio'], table['complement_loss_ratio'])
+        high = np.maximum(table['observed_loss_ratio'], table['complement_loss_ratio'])
+        assert ((table['credibility_loss_ratio'] >= low - 1e-12) &
+                (table['credibility_loss_ratio'] <= high + 1e-12)).all()
+
+
+def test_child_complement_is_parent_estimate():
+    tables = CredibilityEngine(hierarchies=[('Province', 'PostalCode')]).fit(_book())
+
+    parent = tables['Province']['credibility_loss_ratio']
+    child = tables['PostalCode']
+    expected = parent.reindex(child.index.get_level_values('Province')).to_numpy()
+    assert child['complement_loss_ratio'].to_numpy() == pytest.approx(expected)
@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.dedup import Deduplicator, fingerprint
+from benchmarks.data_generator import generate_policy_claims_data
+
+
+def _sources():
+    """Two extracts: the second repeats 300 rows exactly and revises 200 with a later month."""
+    old = generate_policy_claims_data(2000, seed=1)
+    exact = old.iloc[:300]
+    revised = old.iloc[300:500].copy()
+    revised['TotalClaims'] += 1000.0
+    new_rows = generate_policy_claims_data(500, seed=2, row_offset=10_000)
+    return old, pd.concat([exact, revised, new_rows], ignore_index=True)
+
+
+def _run(frames, chunk_rows=None, **kwargs):
+    def chunks(frame):
+        size = chunk_rows or len(frame)
+        return lambda: (frame.iloc[i:i + size] for i in range(0, len(frame), size))
+    dedup = Deduplicator(**kwargs)
+    result = pd.concat(list(dedup.run([chunks(f) for f in frames])), ignore_index=True)
+    return result, dedup.report
+
+
+def test_fingerprint_ignores_int_float_and_column_order():
+    a = pd.DataFrame({'PolicyID': [1, 2], 'TotalClaims': [0, 5]})
+    b = pd.DataFrame({'TotalClaims': [0.0, 5.0], 'PolicyID': [1.0, 2.0]})
+    np.testing.assert_array_equal(fingerprint(a, ['PolicyID', 'TotalClaims']),
+                                  fingerprint(b, ['PolicyID', 'TotalClaims']))
+    assert fingerprint(a, ['PolicyID']).dtype == np.uint64
+
+
+def test_exact_and_key_duplicates_are_dropped():
+    old, new = _sources()
+    result, report = _run([old, new])
+
+    assert report.rows_in == 3000
+    assert report.rows_out == len(result) == 2500
+    assert report.exact_duplicates == 300
+    assert report.key_conflicts == 200
+    assert report.duplicate_keys == 500
+    # Both revisions share the key, so the later source's row is kept
+    assert result['TotalClaims'].sum() == pytest.approx(
+        old['TotalClaims'].sum() + 200 * 1000.0 + new['TotalClaims'].iloc[500:].sum())
+
+
+def test_extra_columns_do_not_turn_copies_into_conflicts():
+    old, new = _sources()
+    result, report = _run([old, new.assign(SourceSystem='extract_b')])
+
+    assert report.exact_duplicates == 300
+    assert report.key_conflicts == 200
+    assert report.rows_out == len(result) == 2500
+
+
+def test_latest_transaction_month_wins():
+    rows = pd.DataFrame({
+        'PolicyID': [1, 1, 2],
+        'UnderwrittenCoverID': [10, 10, 20],
+        'TransactionMonth': ['2015-03-01', '2015-01-01', '2015-01-01'],
+        'TotalClaims': [30.0, 10.0, 5.0]
+    })
+    result, report = _run([rows.iloc[:1], rows.iloc[1:]], keys=['UnderwrittenCoverID', 'PolicyID'], keep='latest')
+    assert report.key_conflicts == 1
+    assert sorted(result['TotalClaims']) == [5.0, 30.0]
+
+    result, _ = _run([rows.iloc[:1], rows.iloc[1:]], keys=['UnderwrittenCoverID', 'PolicyID'], keep='first')
+    assert sorted(result['TotalClaims']) == [5.0, 30.0]
+    result, _ = _run([rows.iloc[:1], rows.iloc[1:]], keys=['UnderwrittenCoverID', 'PolicyID'], keep='last')
+    assert sorted(result['TotalClaims']) == [5.0, 10.0]
+
+
+def test_spilled_run_matches_in_memory(tmp_path):
+    old, new = _sources()
+    expected, expected_report = _run([old, new])
+    result, report = _run([old, new], chunk_rows=250, memory_budget_mb=0.01, n_partitions=4,
+                          spill_dir=str(tmp_path))
+
+    assert report == expected_report
+    pd.testing.assert_frame_equal(result, expected)
+    assert not os.listdir(tmp_path)
+
+
+def test_incomplete_keys_only_drop_exact_copies():
+    rows = pd.DataFrame({
+        'UnderwrittenCoverID': [np.nan, np.nan, np.nan],
+        'PolicyID': [1, 1, 1],
+        'TransactionMonth': ['2015-01-01'] * 3,
+        'TotalClaims': [1.0, 1.0, 2.0]
+    })
+    result, report = _run([rows])
+    assert len(result) == 2
+    assert report.exact_duplicates == 1
+    assert report.key_conflicts == 0
+
+
+def test_unknown_keep_rule():
+    with pytest.raises(ValueError):
+        Deduplicator(keep='newest')
+
+
+def test_latest_needs_keys_without_the_month():
+    with pytest.raises(ValueError, match="keep='last'"):
+        Deduplicator(keep='latest')
@@ -53,3 +53,53 @@ def test_perform_initial_analysis():
     assert not df.empty
     assert 'LossRatio' not in df.columns # Loss ratio is calculated but not added to main df in current impl
     assert df['TotalPremium'].sum() == 2200
+
+def test_pipelined_analysis_matches_serial(tmp_path):
+    path = tmp_path / 'policies.csv'
+    pd.DataFrame({
+        'TransactionMonth': ['2014-01-01', '2014-02-01', '2014-02-01', '2014-03-01', 'bad-date'],
+        'TotalPremium': [1000, 1200, 800, 'n/a', 500],
+        'TotalClaims': [0, 500, 100, 300, 0],
+        'Province': ['Gauteng', 'Western Cape', 'Gauteng', 'Gauteng', 'Limpopo'],
+        'Gender': ['Male', 'Female', 'Male', 'Female', 'Male']
+    }).to_csv(path, index=False)
+    service = EDAService(CSVLoader(), MockPlotter())
+
+    serial = service.perform_initial_analysis(str(path))
+    pipelined = service.perform_initial_analysis(str(path), pipelined=True, chunksize=2)
+
+    pd.testing.assert_frame_equal(serial, pipelined)
+    assert pipelined['TotalPremium'].sum() == 3500
+
+def test_top_risk_segments(tmp_path):
+    path = tmp_path / 'policies.csv'
+    pd.DataFrame({
+        'PostalCode': [2000, 2000, 3000, 4000, 4000],
+        'TotalPremium': [100, 100, 100, 100, 300],
+        'TotalClaims': [0, 300, 50, 0, 0]
+    }).to_csv(path, index=False)
+    service = EDAService(CSVLoader(), MockPlotter())
+
+    top = service.top_risk_segments(str(path), key='PostalCode', k=2, chunksize=2)
+
+    assert top.index.tolist() == [2000, 3000]
+    assert top['LossRatio'].tolist() == [1.5, 0.5]
+
+def test_validation_report_is_kept():
+    class DirtyLoader(CSVLoader):
+        def load_data(self, file_path: str) -> pd.DataFrame:
+            return pd.DataFrame({'TotalPremium': ['1000', 'n/a'], 'TotalClaims': [0, 500]})
+
+    service = EDAService(DirtyLoader(), MockPlotter())
+    service.perform_initial_analysis("dummy.csv")
+
+    assert service.validation_report.rejected_counts == {'TotalPremium': 1}
+    assert service.validation_report.sample_rows == {'TotalPremium': [1]}
+
+def test_estimate_loss_ratio_falls_back_to_exact():
+    service = EDAService(MockLoader(), MockPlotter())
+
+    result = service.estimate_loss_ratio("dummy.csv", by='Province', approximate=True)
+
+    assert (result['method'] == 'exact').all()
+    assert result.loc['Western Cape', 'estimate'] == pytest.approx(500 / 1200)
@@ -0,0 +1,113 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.glm import CategoricalDesign, FrequencySeverityGLM, SparseGLM
+from src.application.modeling_service import ModelingService
+from src.infrastructure.model_store import PickleModelStore
+from benchmarks.data_generator import generate_policy_claims_data
+
+# Relativities against Gauteng, the largest province; the others are priced like it
+TRUE_PROVINCE = {'Western Cape': 1.5, 'KwaZulu-Natal': 0.6}
+
+
+def _book(n=60_000, seed=0):
+    """Claim counts and amounts with known multiplicative province effects."""
+    df = generate_policy_claims_data(n, seed=seed, n_makes=300)
+    rng = np.random.default_rng(seed)
+    exposure = rng.uniform(0.25, 1.0, n)
+    relativity = df['Province'].map(TRUE_PROVINCE).fillna(1.0).to_numpy()
+    counts = rng.poisson(0.5 * exposure * relativity)
+    return df[['Province', 'make']].assign(Exposure=exposure, ClaimCount=counts,
+                                           TotalClaims=counts * rng.gamma(2.0, 2500.0, n))
+
+
+class TestCategoricalDesign:
+
+    def test_csr_from_codes(self):
+        df = pd.DataFrame({'Province': ['A', 'B', 'A', None], 'Gender': ['M', 'F', 'F', 'M']})
+        design = CategoricalDesign(['Province', 'Gender']).fit(df, np.array([1.0, 1.0, 1.0, 5.0]))
+        X = design.transform(df)
+
+        # Base levels carry the most exposure and get no column
+        assert design.base_levels == {'Province': 'Unknown', 'Gender': 'M'}
+        assert X.shape == (4, 3)
+        assert X.nnz == 5
+        dense = pd.DataFrame(X.toarray())
+        assert (dense.sum(axis=1).to_numpy() == [1, 2, 2, 0]).all()
+
+    def test_unseen_levels_map_to_base(self):
+        df = pd.DataFrame({'Province': ['A', 'B', 'B']})
+        design = CategoricalDesign(['Province']).fit(df, np.ones(3))
+        X = design.transform(pd.DataFrame({'Province': ['A', 'Z']}))
+        assert X.toarray().tolist() == [[1.0], [0.0]]
+
+
+class TestSparseGLM:
+
+    def test_poisson_recovers_relativities_with_exposure(self):
+        df = _book()
+        model = SparseGLM('poisson', alpha=1e-6).fit(df, 'ClaimCount', ['Province', 'make'], exposure='Exposure')
+        relativities = model.relativities()['Province']['relativity']
+
+        assert model.converged_
+        assert relativities['Gauteng'] == 1.0
+        assert relativities['Western Cape'] == pytest.approx(1.5, rel=0.05)
+        assert relativities['KwaZulu-Natal'] == pytest.approx(0.6, rel=0.05)
+        # Predicted claim counts add up to the observed total
+        assert model.predict(df, exposure='Exposure').sum() == pytest.approx(df['ClaimCount'].sum(), rel=1e-3)
+
+    def test_tweedie_pure_premium(self):
+        df = _book(seed=1)
+        model = SparseGLM('tweedie', power=1.5, alpha=1e-6).fit(df, 'TotalClaims', ['Province'], exposure='Exposure')
+        relativities = model.relativities()['Province']['relativity']
+        assert relativities['Western Cape'] == pytest.approx(1.5, rel=0.1)
+        assert relativities['KwaZulu-Natal'] == pytest.approx(0.6, rel=0.1)
+
+    def test_frequency_severity(self):
+        df = _book(seed=2)
+        model = FrequencySeverityGLM(alpha=1e-6).fit(df, 'TotalClaims', ['Province'], exposure='Exposure',
+                                                     claim_count='ClaimCount')
+        table = model.relativities()['Province']
+
+        # Severity does not depend on province, so pure premium follows frequency
+        assert table.loc['Western Cape', 'severity'] == pytest.approx(1.0, abs=0.1)
+        assert table.loc['Western Cape', 'relativity'] == pytest.approx(1.5, rel=0.1)
+        assert len(model.predict(df, exposure='Exposure')) == len(df)
+
+    def test_high_cardinality_policy_book(self):
+        df = generate_policy_claims_data(20_000, seed=3, n_postal_codes=2000, n_makes=300)
+        model = SparseGLM('tweedie').fit(df, 'TotalClaims')
+        relativities = model.relativities()
+
+        assert model.design.n_columns > 1000
+        assert set(relativities) == {'Province', 'VehicleType', 'Gender', 'make', 'PostalCode'}
+        assert np.isfinite(model.coef_).all()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SparseGLM('normal')
+        with pytest.raises(ValueError):
+            SparseGLM('tweedie', power=2.5)
+        with pytest.raises(ValueError, match='tweedie'):
+            SparseGLM('poisson', power=1.5)
+        with pytest.raises(ValueError, match='positive'):
+            SparseGLM('gamma').fit(_book(100), 'TotalClaims', ['Province'])
+        with pytest.raises(ValueError):
+            SparseGLM('poisson').fit(_book(100).assign(Exposure=0.0), 'ClaimCount', ['Province'], exposure='Exposure')
+
+
+def test_fit_pricing_glm_is_stored(tmp_path):
+    service = ModelingService(PickleModelStore(str(tmp_path)))
+    df = generate_policy_claims_data(5000, seed=4)
+    relativities = service.fit_pricing_glm(df, structure='frequency_severity', factors=['Province', 'Gender'])
+
+    model, metadata = service.model_store.load('glm_frequency_severity')
+    assert set(relativities) == {'Province', 'Gender'}
+    assert metadata['factors'] == ['Province', 'Gender']
+    assert len(model.predict(df)) == len(df)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.groupby_engine import HighCardinalityGroupBy, KeyEncoder
+
+
+def _policies(n=5000, n_codes=800, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'PostalCode': rng.integers(1000, 1000 + n_codes, n),
+        'TotalPremium': rng.uniform(50, 500, n),
+        'TotalClaims': np.where(rng.random(n) < 0.1, rng.uniform(100, 5000, n), 0.0)
+    })
+
+
+def _expected(df):
+    expected = df.groupby('PostalCode')[['TotalPremium', 'TotalClaims']].sum()
+    expected['count'] = df.groupby('PostalCode').size()
+    expected['LossRatio'] = expected['TotalClaims'] / expected['TotalPremium']
+    return expected
+
+
+def test_key_encoder_is_stable_across_chunks():
+    encoder = KeyEncoder()
+    first = encoder.encode(np.array(['a', 'b', 'a'], dtype=object))
+    second = encoder.encode(np.array(['c', 'a', None], dtype=object))
+
+    assert first.tolist() == [0, 1, 0]
+    assert second.tolist() == [2, 0, -1]
+    assert encoder.keys == ['a', 'b', 'c']
+
+
+def test_in_memory_aggregation_matches_pandas():
+    df = _policies()
+    engine = HighCardinalityGroupBy('PostalCode')
+    for start in range(0, len(df), 1000):
+        engine.update(df.iloc[start:start + 1000])
+
+    result = engine.result().sort_index()
+
+    assert not engine.spilled
+    pd.testing.assert_frame_equal(result, _expected(df), check_dtype=False, check_index_type=False)
+
+
+def test_spilled_aggregation_matches_pandas(tmp_path):
+    df = _policies()
+    # A budget of a few hundred keys forces several spills
+    engine = HighCardinalityGroupBy('PostalCode', memory_budget_mb=0.02, n_partitions=4,
+                                    spill_dir=str(tmp_path))
+    for start in range(0, len(df), 500):
+        engine.update(df.iloc[start:start + 500])
+
+    result = engine.result().sort_index()
+    engine.close()
+
+    assert engine.spilled
+    assert result.index.is_unique
+    pd.testing.assert_frame_equal(result, _expected(df), check_dtype=False, check_index_type=False)
+    assert os.listdir(tmp_path) == []
+
+
+def test_top_k_matches_full_sort(tmp_path):
+    df = _policies()
+    engine = HighCardinalityGroupBy('PostalCode', memory_budget_mb=0.02, n_partitions=4,
+                                    spill_dir=str(tmp_path))
+    engine.update(df)
+
+    top = engine.top_k(5, min_premium=1000)
+    engine.close()
+
+    expected = _expected(df)
+    expected = expected[expected['TotalPremium'] > 1000].nlargest(5, 'LossRatio')
+    assert top.index.tolist() == expected.index.tolist()
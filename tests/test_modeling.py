@@ -180,3 +180,84 @@ class TestModelEvaluation:
         
         assert 0 <= accuracy <= 1
         assert 0 <= f1 <= 1
+
+
+class TestIncrementalTraining:
+    """Test warm-started model updates and promotion gating."""
+    
+    def setup_method(self):
+        from benchmarks.data_generator import generate_insurance_data
+        self.history = generate_insurance_data(2000, seed=1)
+        self.delta = generate_insurance_data(400, seed=2)
+    
+    def _service(self, tmp_path, **kwargs):
+        from src.application.modeling_service import ModelingService
+        from src.infrastructure.model_store import PickleModelStore
+        return ModelingService(PickleModelStore(str(tmp_path)), **kwargs)
+    
+    def test_prepare_features_fixed_columns(self):
+        """A delta missing a region still gets every feature column."""
+        from src.application.modeling_service import FEATURE_COLUMNS, prepare_features
+        
+        X, y = prepare_features(self.delta[self.delta['region'] == 'northeast'])
+        assert list(X.columns) == FEATURE_COLUMNS
+        assert (X['region_southwest'] == 0).all()
+        assert len(y) == len(X)
+    
+    @pytest.mark.parametrize('model_type', ['random_forest', 'xgboost', 'sgd'])
+    def test_update_warm_starts_stored_model(self, tmp_path, model_type):
+        """Updates continue from the persisted model on the new rows only."""
+        service = self._service(tmp_path, drift_tolerance=1.0)
+        service.train(self.history, model_type, n_estimators=20)
+        report = service.update(self.delta, model_type, extra_estimators=5)
+        
+        model, metadata = service.model_store.load(model_type)
+        assert report['promoted']
+        assert report['rows_updated'] == 320
+        assert metadata['updates'] == 1
+        assert metadata['rows_trained'] == 1600 + 320
+        if model_type == 'random_forest':
+            assert len(model.estimators_) == 25
+        elif model_type == 'xgboost':
+            assert model.get_booster().num_boosted_rounds() == 25
+        assert len(service.predict(self.delta, model_type)) == len(self.delta)
+    
+    def test_sgd_update_on_shifted_rows_keeps_earlier_predictions(self):
+        """Older policyholders arriving later do not re-scale what the weights already mean."""
+        from src.application.modeling_service import ScaledSGDRegressor, prepare_features
+        
+        X, y = prepare_features(self.history)
+        model = ScaledSGDRegressor().fit(X, y)
+        mean_before = model.scaler.mean_.copy()
+        rmse_before = np.sqrt(np.mean((model.predict(X) - y) ** 2))
+        
+        # A delta the model already predicts perfectly, from a shifted age range
+        X_new, _ = prepare_features(self.delta[self.delta['age'] >= 50])
+        model.partial_fit(X_new, model.predict(X_new))
+        
+        rmse_after = np.sqrt(np.mean((model.predict(X) - y) ** 2))
+        assert np.array_equal(model.scaler.mean_, mean_before)
+        assert rmse_after <= rmse_before * 1.002
+    
+    def test_drifted_candidate_is_not_promoted(self, tmp_path):
+        """A candidate worse than the current model on the holdout is discarded."""
+        service = self._service(tmp_path, drift_tolerance=0.0)
+        service.train(self.history, 'random_forest', n_estimators=20)
+        before, _ = service.model_store.load('random_forest')
+        
+        # New rows whose target is noise degrade the forest on a clean holdout
+        noisy = self.delta.assign(charges=np.random.default_rng(0).uniform(0, 60000, len(self.delta)))
+        report = service.update(noisy, 'random_forest', extra_estimators=40, holdout=self.history.tail(400))
+        
+        after, metadata = service.model_store.load('random_forest')
+        assert not report['promoted']
+        assert report['drift'] > 0
+        assert metadata['updates'] == 0
+        assert len(after.estimators_) == len(before.estimators_)
+    
+    def test_update_without_stored_model_trains(self, tmp_path):
+        """The first update falls back to a full fit."""
+        service = self._service(tmp_path)
+        report = service.update(self.history, 'sgd')
+        assert report['promoted']
+        assert service.model_store.load('sgd') is not None
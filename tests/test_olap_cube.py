@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.olap_cube import LossCube
+
+
+def _policies(n=3000, months=('2014-01-01', '2014-02-01', '2014-03-01'), seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'TransactionMonth': rng.choice(months, n),
+        'TotalPremium': rng.uniform(50, 500, n),
+        'TotalClaims': np.where(rng.random(n) < 0.1, rng.uniform(100, 5000, n), 0.0),
+        'Province': rng.choice(['Gauteng', 'Western Cape', 'Limpopo'], n),
+        'VehicleType': rng.choice(['Passenger Vehicle', 'Bus'], n),
+        'Gender': rng.choice(['Male', 'Female', None], n)
+    })
+
+
+def test_rollup_matches_groupby():
+    df = _policies()
+    cube = LossCube.build(df)
+
+    result = cube.query(by=['Province'])
+    expected = df.groupby('Province')[['TotalPremium', 'TotalClaims']].agg(['sum', 'mean', 'std', 'count'])
+
+    assert result['count'].tolist() == expected[('TotalPremium', 'count')].tolist()
+    assert np.allclose(result['TotalClaims'], expected[('TotalClaims', 'sum')])
+    assert np.allclose(result['TotalPremium_mean'], expected[('TotalPremium', 'mean')])
+    assert np.allclose(result['TotalClaims_std'], expected[('TotalClaims', 'std')])
+    assert np.allclose(result['LossRatio'],
+                       expected[('TotalClaims', 'sum')] / expected[('TotalPremium', 'sum')])
+
+
+def test_slice_and_multi_dimension_rollup():
+    df = _policies()
+    cube = LossCube.build(df)
+
+    result = cube.query(by=['TransactionMonth', 'VehicleType'], where={'Province': ['Gauteng', 'Limpopo']})
+    subset = df[df['Province'].isin(['Gauteng', 'Limpopo'])].assign(
+        TransactionMonth=lambda d: d['TransactionMonth'].str[:7])
+    expected = subset.groupby(['TransactionMonth', 'VehicleType'])['TotalPremium'].sum()
+
+    assert result.index.names == ['TransactionMonth', 'VehicleType']
+    assert np.allclose(result['TotalPremium'], expected)
+
+
+def test_missing_members_are_kept_as_unknown():
+    df = _policies()
+    cube = LossCube.build(df)
+
+    assert 'Unknown' in cube.labels('Gender')
+    assert cube.query()['TotalPremium'].iloc[0] == pytest.approx(df['TotalPremium'].sum())
+
+
+def test_incremental_update_equals_full_build():
+    history = _policies(seed=1)
+    new_month = _policies(months=('2014-04-01',), seed=2)
+
+    cube = LossCube.build(history).update(new_month)
+    full = LossCube.build(pd.concat([history, new_month]))
+
+    pd.testing.assert_frame_equal(cube.query(by=['TransactionMonth', 'Gender']),
+                                  full.query(by=['TransactionMonth', 'Gender']))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    cube = LossCube.build(_policies())
+    path = str(tmp_path / 'cube.npz')
+
+    cube.save(path)
+    loaded = LossCube.load(path)
+
+    pd.testing.assert_frame_equal(loaded.query(by=['Province', 'Gender']),
+                                  cube.query(by=['Province', 'Gender']))
+    assert loaded.labels('Province') == cube.labels('Province')
@@ -0,0 +1,87 @@
+import pytest
+import pandas as pd
+import threading
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.infrastructure.pipeline import prefetch, BackgroundWriter
+from src.infrastructure.plotting import MatplotlibPlotter
+
+
+def test_prefetch_preserves_order():
+    assert list(prefetch(range(100), max_prefetch=3)) == list(range(100))
+
+
+def test_prefetch_applies_backpressure():
+    produced = []
+
+    def source():
+        for i in range(50):
+            produced.append(i)
+            yield i
+
+    items = prefetch(source(), max_prefetch=2)
+    assert next(items) == 0
+    time.sleep(0.05)
+    # One item consumed, at most two queued and one blocked in put()
+    assert len(produced) <= 4
+    items.close()
+
+
+def test_prefetch_reraises_producer_errors():
+    def source():
+        yield 1
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        list(prefetch(source()))
+
+
+def test_background_writer_runs_tasks_off_thread():
+    threads = []
+    with BackgroundWriter(max_pending=2) as writer:
+        for _ in range(5):
+            writer.submit(lambda: threads.append(threading.current_thread().name))
+
+    assert threads == ['background-writer'] * 5
+
+
+def test_background_writer_surfaces_errors():
+    writer = BackgroundWriter()
+    writer.submit(lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        writer.flush()
+    writer.close()
+
+
+def test_background_writer_close_stops_thread_after_task_error():
+    writer = BackgroundWriter()
+    writer.submit(lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        writer.close()
+    assert not writer._thread.is_alive()
+
+
+def test_background_writer_keeps_the_with_block_error():
+    with pytest.raises(KeyError):
+        with BackgroundWriter() as writer:
+            writer.submit(lambda: 1 / 0)
+            raise KeyError('body')
+    assert not writer._thread.is_alive()
+
+
+def test_async_plotter_writes_figures_and_stops_its_thread(tmp_path):
+    data = pd.DataFrame({'TotalClaims': [0.0, 10.0, 250.0]})
+    with MatplotlibPlotter(output_dir=str(tmp_path), async_writes=True) as plotter:
+        writer_thread = plotter._writer._thread
+        plotter.plot_boxplot(data, 'TotalClaims')
+        plotter.plot_distribution(data, 'TotalClaims')
+
+    assert sorted(os.listdir(tmp_path)) == ['box_TotalClaims.png', 'dist_TotalClaims.png']
+    assert not writer_thread.is_alive()
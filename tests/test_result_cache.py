@@ -0,0 +1,146 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.ab_testing_service import ABTestingService
+from src.application.eda_service import EDAService
+from src.application.memoization import file_fingerprint, memoize, result_key
+from src.infrastructure.csv_loader import CSVLoader
+from src.infrastructure.result_cache import ResultCache
+from benchmarks.data_generator import generate_insurance_data, generate_policy_claims_data
+
+
+class CountingLoader(CSVLoader):
+    """CSV loader that counts how often the file is actually read."""
+    def __init__(self):
+        self.loads = 0
+
+    def load_data(self, file_path):
+        self.loads += 1
+        return super().load_data(file_path)
+
+    def load_chunks(self, file_path, chunksize=100_000, max_prefetch=2):
+        self.loads += 1
+        return super().load_chunks(file_path, chunksize, max_prefetch)
+
+
+class TestResultCache:
+
+    def test_roundtrip_and_persistence(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.set('a', {'p_value': 0.01, 'table': pd.DataFrame({'x': [1, 2]})})
+
+        assert cache.get('a')['p_value'] == 0.01
+        assert cache.get('missing') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        # A fresh instance (another process or session) reads it from disk
+        pd.testing.assert_frame_equal(ResultCache(str(tmp_path)).get('a')['table'], pd.DataFrame({'x': [1, 2]}))
+
+    def test_returned_values_are_copies(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.set('a', {'values': [1, 2]})
+        cache.get('a')['values'].append(3)
+        assert cache.get('a') == {'values': [1, 2]}
+
+    def test_memory_lru_eviction(self, tmp_path):
+        blob = np.zeros(40_000)  # ~320 KB pickled
+        cache = ResultCache(str(tmp_path), max_memory_mb=1)
+        for key in 'abcd':
+            cache.set(key, blob)
+        cache.get('a')  # reloads 'a' from disk and evicts the oldest in memory
+        assert 'a' in cache._memory
+        assert 'b' not in cache._memory
+        assert cache._memory_bytes <= cache.max_memory_bytes
+
+    def test_disk_size_eviction(self, tmp_path):
+        blob = np.zeros(40_000)
+        cache = ResultCache(str(tmp_path), max_memory_mb=0, max_disk_mb=1)
+        cache.set('a', blob)
+        cache.set('b', blob)
+        time.sleep(0.01)
+        cache.get('a')  # 'a' is now more recently used than 'b'
+        time.sleep(0.01)
+        cache.set('c', blob)
+        cache.set('d', blob)
+
+        remaining = sorted(f[:-4] for f in os.listdir(tmp_path))
+        assert 'b' not in remaining
+        assert 'd' in remaining
+        assert sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path)) <= 1024 * 1024
+
+    def test_clear(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.set('a', 1)
+        cache.clear()
+        assert cache.get('a') is None
+        assert not os.listdir(tmp_path)
+
+
+class TestKeys:
+
+    def test_key_depends_on_method_data_and_params(self, tmp_path):
+        path = tmp_path / 'data.csv'
+        path.write_text('a\n1\n')
+        fingerprint = file_fingerprint(str(path))
+
+        key = result_key('run_all_tests', fingerprint, alpha=0.05)
+        assert key == result_key('run_all_tests', fingerprint, alpha=0.05)
+        assert key != result_key('run_all_tests', fingerprint, alpha=0.01)
+        assert key != result_key('other', fingerprint, alpha=0.05)
+        assert result_key('run_all_tests', file_fingerprint(str(tmp_path / 'missing.csv'))) is None
+
+    def test_cached_none_is_a_hit(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        assert memoize(cache, 'k', compute) is None
+        assert memoize(cache, 'k', compute) is None
+        assert len(calls) == 1
+        assert cache.get('missing', 'default') == 'default'
+
+
+class TestServiceMemoization:
+
+    def test_run_all_tests_is_cached_per_file_and_alpha(self, tmp_path):
+        path = str(tmp_path / 'insurance.csv')
+        generate_insurance_data(500, seed=1).to_csv(path, index=False)
+        loader = CountingLoader()
+        service = ABTestingService(loader, result_cache=ResultCache(str(tmp_path / 'cache')))
+
+        first = service.run_all_tests(path)
+        second = service.run_all_tests(path)
+        assert loader.loads == 1
+        assert second['smoker']['p_value'] == first['smoker']['p_value']
+
+        service.alpha = 0.01
+        service.run_all_tests(path)
+        assert loader.loads == 2
+
+        # Rewriting the file changes its fingerprint
+        generate_insurance_data(600, seed=2).to_csv(path, index=False)
+        os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+        service.run_all_tests(path)
+        assert loader.loads == 3
+
+    def test_estimate_loss_ratio_is_cached_per_file_and_group(self, tmp_path, null_plotter):
+        path = str(tmp_path / 'claims.csv')
+        generate_policy_claims_data(2000, seed=1).to_csv(path, index=False)
+        loader = CountingLoader()
+        service = EDAService(loader, null_plotter, result_cache=ResultCache(str(tmp_path / 'cache')))
+
+        first = service.estimate_loss_ratio(path, by='Province')
+        second = service.estimate_loss_ratio(path, by='Province')
+        assert loader.loads == 1
+        pd.testing.assert_frame_equal(first, second)
+
+        service.estimate_loss_ratio(path)
+        assert loader.loads == 2
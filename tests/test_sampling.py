@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.sampling import StratifiedSampleStore, approximate_estimates
+from src.application.ab_testing_service import ABTestingService
+from src.infrastructure.csv_loader import CSVLoader
+
+
+def _insurance(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    smoker = rng.random(n) < 0.2
+    return pd.DataFrame({
+        'smoker': np.where(smoker, 'yes', 'no'),
+        'region': rng.choice(['northeast', 'northwest', 'southeast', 'southwest'], n),
+        'charges': np.where(smoker, 30000, 8000) + rng.normal(0, 2000, n)
+    })
+
+
+class FrameLoader(CSVLoader):
+    def __init__(self, df):
+        self.df = df
+    def load_data(self, file_path: str) -> pd.DataFrame:
+        return self.df.copy()
+
+
+def test_sample_respects_strata_quotas():
+    df = _insurance()
+    store = StratifiedSampleStore.build(df, fraction=0.02, min_per_stratum=50)
+
+    assert store.strata == ['smoker']
+    counts = store.sample['smoker'].value_counts()
+    assert counts['no'] == int(np.ceil(0.02 * (df['smoker'] == 'no').sum()))
+    assert counts['yes'] >= 50
+    assert store.population.sum() == len(df)
+
+
+def test_group_estimates_cover_true_means():
+    df = _insurance()
+    store = StratifiedSampleStore.build(df, fraction=0.05)
+
+    estimates = store.estimate_by('region', 'charges')
+    truth = df.groupby('region')['charges'].mean()
+
+    assert (estimates['ci_low'] <= truth).all() and (truth <= estimates['ci_high']).all()
+    assert (estimates['relative_error'] < 0.1).all()
+
+
+def test_ratio_estimate_with_full_sample_is_exact():
+    df = pd.DataFrame({'Province': ['A', 'A', 'B', 'B'], 'TotalPremium': [100.0, 100, 200, 200],
+                       'TotalClaims': [0.0, 50, 100, 300]})
+    store = StratifiedSampleStore.build(df, min_per_stratum=10)
+
+    estimate = store.estimate_ratio('TotalClaims', 'TotalPremium')
+
+    assert estimate.value == pytest.approx(450 / 600)
+    # Every row sampled: the finite population correction removes all error
+    assert estimate.std_error == pytest.approx(0)
+
+
+def test_falls_back_when_precision_is_not_met(tmp_path):
+    df = _insurance()
+    store = StratifiedSampleStore.build(df, fraction=0.001, min_per_stratum=5)
+    path = str(tmp_path / 'sample.pkl')
+    store.save(path)
+
+    loaded = StratifiedSampleStore.load(path)
+
+    assert approximate_estimates(loaded, 'charges', 'smoker', max_relative_error=0.0001) is None
+    assert approximate_estimates(loaded, 'charges', 'smoker', max_relative_error=0.5) is not None
+
+
+def test_ab_service_approximate_mode():
+    df = _insurance()
+    service = ABTestingService(FrameLoader(df), StratifiedSampleStore.build(df, fraction=0.05))
+
+    approx = service.estimate_mean_charges("dummy.csv", by='smoker', approximate=True)
+    exact = service.estimate_mean_charges("dummy.csv", by='smoker')
+
+    assert (approx['method'] == 'approximate').all()
+    assert (exact['method'] == 'exact').all()
+    assert np.allclose(approx['estimate'], exact['estimate'], rtol=0.05)
+    pd.testing.assert_series_equal(exact['estimate'], df.groupby('smoker')['charges'].mean(),
+                                   check_names=False)
@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.time_series import RollingSegmentSeries
+
+
+def _policies(months, provinces=('Gauteng', 'Limpopo', 'Free State'), n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'TransactionMonth': rng.choice(months, n),
+        'Province': rng.choice(provinces, n),
+        'TotalPremium': rng.uniform(50, 500, n),
+        'TotalClaims': np.where(rng.random(n) < 0.2, rng.uniform(100, 2000, n), 0.0)
+    })
+
+
+def _monthly(df):
+    df = df.assign(month=pd.to_datetime(df['TransactionMonth']).dt.to_period('M'))
+    return df.pivot_table(index='Province', columns='month', values=['TotalPremium', 'TotalClaims'],
+                          aggfunc='sum', fill_value=0)
+
+
+def test_rolling_loss_ratio_matches_recompute():
+    months = pd.date_range('2014-01-01', periods=15, freq='MS').strftime('%Y-%m-%d')
+    df = _policies(months)
+    series = RollingSegmentSeries(windows=(3, 12)).append_frame(df, 'Province')
+
+    monthly = _monthly(df)
+    premium = monthly['TotalPremium'].T.rolling(3).sum().T
+    claims = monthly['TotalClaims'].T.rolling(3).sum().T
+    expected = (claims / premium).loc[series.segments]
+
+    result = series.frame('loss_ratio_3m')
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert series.frame('loss_ratio_12m').iloc[:, :11].isna().all().all()
+    assert series.frame('loss_ratio_12m').iloc[:, 11:].notna().all().all()
+
+
+def test_incremental_append_equals_batch():
+    months = pd.date_range('2014-01-01', periods=14, freq='MS').strftime('%Y-%m-%d')
+    df = _policies(months)
+    history = df[df['TransactionMonth'] < months[10]]
+    new = df[df['TransactionMonth'] >= months[10]]
+
+    incremental = RollingSegmentSeries().append_frame(history, 'Province').append_frame(new, 'Province')
+    batch = RollingSegmentSeries().append_frame(df, 'Province')
+
+    for metric in ['loss_ratio_3m', 'loss_ratio_12m', 'cumulative_loss_ratio', 'premium_growth']:
+        pd.testing.assert_frame_equal(incremental.frame(metric).loc[batch.segments], batch.frame(metric))
+
+
+def test_gaps_and_new_segments():
+    series = RollingSegmentSeries(windows=(2,))
+    series.append_month('2014-01', ['A'], [100.0], [50.0])
+    series.append_frame(pd.DataFrame({'TransactionMonth': ['2014-03-01'], 'Province': ['B'],
+                                      'TotalPremium': [200.0], 'TotalClaims': [20.0]}), 'Province')
+
+    assert [str(m) for m in series.months] == ['2014-01', '2014-02', '2014-03']
+    premium = series.frame('premium')
+    assert premium.loc['A'].tolist() == [100.0, 0.0, 0.0]
+    assert np.isnan(premium.loc['B', pd.Period('2014-01', 'M')])
+    assert series.latest().loc['B', 'loss_ratio_2m'] == pytest.approx(0.1)
+
+
+def test_late_rows_are_added_to_existing_months():
+    def rows(months, premiums, claims):
+        return pd.DataFrame({'TransactionMonth': months, 'Province': ['A'] * len(months),
+                             'TotalPremium': premiums, 'TotalClaims': claims})
+
+    series = RollingSegmentSeries(windows=(2,))
+    series.append_frame(rows(['2014-01-01', '2014-02-01'], [100.0, 100.0], [10.0, 10.0]), 'Province')
+    series.append_frame(rows(['2014-02-01', '2014-03-01'], [500.0, 100.0], [400.0, 10.0]), 'Province')
+
+    everything = RollingSegmentSeries(windows=(2,)).append_frame(
+        rows(['2014-01-01', '2014-02-01', '2014-02-01', '2014-03-01'],
+             [100.0, 100.0, 500.0, 100.0], [10.0, 10.0, 400.0, 10.0]), 'Province')
+    assert series.frame('premium').loc['A'].tolist() == [100.0, 600.0, 100.0]
+    assert series.latest().loc['A', 'cumulative_loss_ratio'] == pytest.approx(430 / 800)
+    for metric in ['loss_ratio_2m', 'cumulative_loss_ratio', 'premium_growth']:
+        pd.testing.assert_frame_equal(series.frame(metric), everything.frame(metric))
+
+    # Later months keep rolling from the restated state
+    april = rows(['2014-04-01'], [100.0], [50.0])
+    series.append_frame(april, 'Province')
+    everything.append_frame(april, 'Province')
+    pd.testing.assert_frame_equal(series.frame('loss_ratio_2m'), everything.frame('loss_ratio_2m'))
+
+
+def test_months_must_be_in_order():
+    series = RollingSegmentSeries()
+    series.append_month('2014-02', ['A'], [1.0], [0.0])
+
+    with pytest.raises(ValueError):
+        series.append_month('2014-01', ['A'], [1.0], [0.0])
@@ -0,0 +1,68 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.application.validation import SchemaValidator
+
+
+def _chunk(premiums, months):
+    return pd.DataFrame({
+        ' TotalPremium ': premiums,
+        'TotalClaims': [0.0] * len(premiums),
+        'TransactionMonth': months
+    })
+
+
+def test_coerces_and_counts_rejected_values():
+    validator = SchemaValidator()
+    df = validator.validate(_chunk(['100', 'abc', None, '7.5'], ['2014-01-01', '2014-02-01', 'soon', None]))
+
+    assert list(df.columns) == ['TotalPremium', 'TotalClaims', 'TransactionMonth']
+    assert pd.api.types.is_float_dtype(df['TotalPremium'])
+    assert pd.api.types.is_datetime64_any_dtype(df['TransactionMonth'])
+    # Values missing in the source are not counted as rejections
+    assert validator.report.rejected_counts == {'TotalPremium': 1, 'TransactionMonth': 1}
+    assert validator.report.sample_rows == {'TotalPremium': [1], 'TransactionMonth': [2]}
+
+
+def test_row_numbers_continue_across_chunks():
+    validator = SchemaValidator(max_samples=2)
+    chunks = [_chunk(['1', 'x'], ['2014-01-01'] * 2),
+              _chunk(['y', 'z', '3'], ['2014-01-01'] * 3)]
+
+    list(validator.validate_chunks(chunks))
+
+    assert validator.report.rows_checked == 5
+    assert validator.report.rejected_counts['TotalPremium'] == 3
+    assert validator.report.sample_rows['TotalPremium'] == [1, 2]
+
+
+def test_typed_columns_pass_through_without_copy():
+    df = pd.DataFrame({'TotalPremium': np.array([1.0, 2.0]), 'TotalClaims': np.array([0.0, 1.0])})
+    before = df['TotalPremium'].to_numpy()
+
+    out = SchemaValidator().validate(df)
+
+    assert np.shares_memory(out['TotalPremium'].to_numpy(), before)
+
+
+def test_callers_frame_is_not_modified():
+    df = pd.DataFrame({' TotalPremium ': ['1', 'x'], 'TotalClaims': [0.0, 1.0]})
+
+    out = SchemaValidator().validate(df)
+
+    assert list(df.columns) == [' TotalPremium ', 'TotalClaims']
+    assert df[' TotalPremium '].tolist() == ['1', 'x']
+    assert out['TotalPremium'].tolist()[0] == 1.0
+
+
+def test_missing_required_columns_are_reported():
+    validator = SchemaValidator()
+    validator.validate(pd.DataFrame({'TotalPremium': [1.0]}))
+
+    assert validator.report.missing_columns == ['TotalClaims']
+    assert validator.report.summary().empty